@@ -10,8 +10,50 @@
 # swap(a, 0, 2)
 # print(a)
 
-"""Algoritm of search and sort"""
-import random
+"""Algoritm of search and sort
+
+Importing the module only defines the functions: the demo runs under
+__main__. The check below fails if the import calls anything from the
+module body (a function of the module, of another module or a builtin
+such as open or sorted) other than the import machinery, or if the
+module's own import time is above 50 ms.
+
+>>> import subprocess, sys
+>>> code = '''
+... import sys
+... calls = []
+... def in_module(code):
+...     return code.co_filename.endswith('algorithms.py') and code.co_name == '<module>'
+... def profile(frame, event, arg):
+...     code = frame.f_code
+...     if event == 'call' and not code.co_filename.startswith('<frozen importlib'):
+...         if (code.co_filename.endswith('algorithms.py') and code.co_name != '<module>'
+...                 or frame.f_back is not None and in_module(frame.f_back.f_code)):
+...             calls.append(code.co_name)
+...     elif event == 'c_call' and in_module(code) and arg.__name__ != '__build_class__':
+...         calls.append(arg.__name__)
+... sys.setprofile(profile)
+... import algorithms
+... sys.setprofile(None)
+... print(calls)
+... '''
+>>> result = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+...                         cwd=os.path.dirname(os.path.abspath(__file__)),
+...                         capture_output=True, text=True, check=True)
+>>> result.stdout.strip()
+'[]'
+>>> [int(line.split('|')[0].split(':')[1]) < 50_000
+...  for line in result.stderr.splitlines() if line.endswith('| algorithms')]
+[True]
+"""
+import heapq
+import os
+import sys
+import tempfile
+from bisect import bisect_left, bisect_right
+from itertools import islice
+
+
 def linear_search(list_of_values, value):
     """
     Performs a linear search to find the index of a value in a list.
@@ -35,9 +77,6 @@ def linear_search(list_of_values, value):
         if cur_v == value:
             return cur_i
     return -1
-result = linear_search([2, 3, 4, 5], 4)
-print("Linear search:")
-print(result)
 
 
 def selection_sort(lst):
@@ -68,13 +107,6 @@ def selection_sort(lst):
         lst[i], lst[min_i] = lst[min_i], el
     return lst
 
-unsorted = [9, 1, 8, 2, 7, 3, 6, 4, 5]
-print("Unsorted:")
-print(unsorted)
-sorted_lsr = selection_sort(unsorted)
-print("Selection sort:")
-print(sorted_lsr)
-
 
 # def linear_search(list_of_values, value):
 #     """Linear search"""
@@ -86,13 +118,15 @@ print(sorted_lsr)
 # print("Linear search:")
 # print(result)
 
-def binary_search(list_of_values, value):
+def binary_search(list_of_values, value, key=None):
     """
     Performs a binary search on a SORTED list.
 
     Args:
         list_of_values: A sorted list of integers.
         value: The value to search for.
+        key: Optional function of one argument; if given, the list must be
+            sorted by it and value is compared with key(element).
 
     Returns:
         int: The index of the value if found, otherwise -1.
@@ -106,35 +140,286 @@ def binary_search(list_of_values, value):
         -1
         >>> binary_search([], 1)
         -1
+        >>> binary_search([('a', 1), ('b', 4), ('c', 9)], 4, key=lambda pair: pair[1])
+        1
     """
     m = len(list_of_values)//2
     l = 0
     r = len(list_of_values) - 1
     while l <= r:
         m = (l + r)//2
+        current = list_of_values[m] if key is None else key(list_of_values[m])
 
-        if list_of_values[m] == value:
+        if current == value:
             return m
         # elif l == r:
         #     return -1
-        if list_of_values[m] < value:
+        if current < value:
             #move left limit
             l = m + 1
-        elif list_of_values[m] > value:
+        elif current > value:
             #move right limit
             r = m - 1
     return -1
 
-result = binary_search([2, 3, 4, 5], 3)
-print("Binary search:")
-print (result)
 
-def quick_sort(lst):
+def lower_bound(list_of_values, value, key=None):
+    """
+    Returns the index of the first element of a SORTED list which is not
+    less than value (len(list_of_values) if there is no such element).
+
+    Examples:
+        >>> lower_bound([1, 2, 2, 2, 5], 2)
+        1
+        >>> lower_bound([1, 2, 2, 2, 5], 3)
+        4
+        >>> lower_bound(['a', 'bb', 'ccc'], 2, key=len)
+        1
+    """
+    return bisect_left(list_of_values, value, key=key)
+
+
+def upper_bound(list_of_values, value, key=None):
+    """
+    Returns the index of the first element of a SORTED list which is
+    greater than value (len(list_of_values) if there is no such element).
+
+    Examples:
+        >>> upper_bound([1, 2, 2, 2, 5], 2)
+        4
+        >>> upper_bound([1, 2, 2, 2, 5], 5)
+        5
+    """
+    return bisect_right(list_of_values, value, key=key)
+
+
+def count_range(list_of_values, low, high, key=None):
+    """
+    Counts the elements of a SORTED list with low <= element <= high.
+
+    Examples:
+        >>> count_range([1, 2, 2, 2, 5, 7], 2, 5)
+        4
+        >>> count_range([1, 2, 3], 5, 9)
+        0
+    """
+    if high < low:
+        return 0
+    return upper_bound(list_of_values, high, key) - lower_bound(list_of_values, low, key)
+
+
+def search_many(sorted_list, queries):
+    """
+    Searches many values in a SORTED list at once.
+
+    The queries are sorted and answered in one sweep over the list, so the
+    search never goes back. If there are few queries compared to the list,
+    the sweep jumps forward by binary search instead of one by one. A NumPy
+    array is searched with numpy.searchsorted.
+
+    Args:
+        sorted_list: A sorted list (or NumPy array) of values.
+        queries: The values to search for.
+
+    Returns:
+        list[int]: For every query, the index of its first occurrence,
+            or -1 if it is not in the list (a NumPy array for NumPy input).
+
+    Examples:
+        >>> search_many([1, 3, 3, 5, 8], [8, 2, 3, 1, 9])
+        [4, -1, 1, 0, -1]
+        >>> search_many(list(range(0, 1000, 2)), [998, 3, 0])
+        [499, -1, 0]
+        >>> search_many([], [1])
+        [-1]
+    """
+    numpy = sys.modules.get('numpy')
+    if numpy is not None and isinstance(sorted_list, numpy.ndarray):
+        queries = numpy.asarray(queries)
+        indexes = numpy.searchsorted(sorted_list, queries)
+        found = indexes < len(sorted_list)
+        found[found] = sorted_list[indexes[found]] == queries[found]
+        return numpy.where(found, indexes, -1)
+
+    queries = list(queries)
+    size = len(sorted_list)
+    result = [-1] * len(queries)
+    sweep = len(queries) * size.bit_length() >= size
+    i = 0
+    for query_index in sorted(range(len(queries)), key=queries.__getitem__):
+        query = queries[query_index]
+        if sweep:
+            while i < size and sorted_list[i] < query:
+                i += 1
+        else:
+            i = bisect_left(sorted_list, query, i)
+        if i < size and sorted_list[i] == query:
+            result[query_index] = i
+    return result
+
+
+INSERTION_CUTOFF = 16
+MIN_RUN = 8
+MIN_GALLOP = 7
+
+
+def _insertion_sort_range(keys, values, lo, hi):
+    """
+    Sorts keys[lo:hi + 1] by insertion, moving values (if any) together with keys.
+    """
+    for i in range(lo + 1, hi + 1):
+        temp = keys[i]
+        if values is not None:
+            temp_value = values[i]
+        j = i - 1
+        while j >= lo and temp < keys[j]:
+            keys[j + 1] = keys[j]
+            if values is not None:
+                values[j + 1] = values[j]
+            j -= 1
+        keys[j + 1] = temp
+        if values is not None:
+            values[j + 1] = temp_value
+
+
+def _swap(keys, values, i, j):
+    """
+    Swaps two elements of keys and the corresponding elements of values.
+    """
+    keys[i], keys[j] = keys[j], keys[i]
+    if values is not None:
+        values[i], values[j] = values[j], values[i]
+
+
+def _sift_down(keys, values, lo, root, end):
+    """
+    Helper function for _heap_sort_range. Sifts the root of the heap
+    stored in keys[lo:end] down to its place.
+    """
+    while True:
+        child = 2 * root + 1
+        if child >= end - lo:
+            return
+        if child + 1 < end - lo and keys[lo + child] < keys[lo + child + 1]:
+            child += 1
+        if not keys[lo + root] < keys[lo + child]:
+            return
+        _swap(keys, values, lo + root, lo + child)
+        root = child
+
+
+def _heap_sort_range(keys, values, lo, hi):
+    """
+    Sorts keys[lo:hi + 1] by heap sort. Used when quick sort recursion
+    gets too deep, so the worst case stays O(n log n).
+    """
+    size = hi - lo + 1
+    for root in range(size // 2 - 1, -1, -1):
+        _sift_down(keys, values, lo, root, lo + size)
+    for end in range(lo + size - 1, lo, -1):
+        _swap(keys, values, lo, end)
+        _sift_down(keys, values, lo, 0, end)
+
+
+def quick_sort_inplace(lst, key=None):
+    """
+    Sorts a list in place using introsort: quick sort with three-way
+    partitioning and an explicit stack, heap sort when the partitions
+    get too deep and insertion sort for small partitions.
+
+    Args:
+        lst: A list of comparable values.
+        key: Optional function of one argument used to extract the
+            comparison key from every element (computed once per element).
+
+    Returns:
+        list: The same list, sorted.
+
+    Examples:
+        >>> quick_sort_inplace([3, 1, 2, 3, 1])
+        [1, 1, 2, 3, 3]
+        >>> quick_sort_inplace(['ccc', 'a', 'bb'], key=len)
+        ['a', 'bb', 'ccc']
+        >>> data = list(range(5000, 0, -1)) + [7] * 5000
+        >>> quick_sort_inplace(data) == sorted(data)
+        True
+    """
+    if key is None:
+        keys, values = lst, None
+    else:
+        keys, values = [key(elem) for elem in lst], lst
+
+    stack = [(0, len(lst) - 1, 2 * len(lst).bit_length())]
+    while stack:
+        lo, hi, depth = stack.pop()
+        if hi - lo < INSERTION_CUTOFF:
+            _insertion_sort_range(keys, values, lo, hi)
+            continue
+        if depth == 0:
+            _heap_sort_range(keys, values, lo, hi)
+            continue
+
+        # the median of three is moved to keys[lo] and used as pivot
+        mid = (lo + hi) // 2
+        if keys[mid] < keys[lo]:
+            _swap(keys, values, mid, lo)
+        if keys[hi] < keys[lo]:
+            _swap(keys, values, hi, lo)
+        if keys[hi] < keys[mid]:
+            _swap(keys, values, hi, mid)
+        _swap(keys, values, lo, mid)
+        pivot = keys[lo]
+
+        # Bentley-McIlroy three-way partition: keys equal to the pivot are
+        # gathered at both ends and then swapped into the middle
+        i, j = lo, hi + 1
+        p, q = lo, hi + 1
+        while True:
+            i += 1
+            while keys[i] < pivot and i != hi:
+                i += 1
+            j -= 1
+            while pivot < keys[j] and j != lo:
+                j -= 1
+            if i == j and not keys[i] < pivot and not pivot < keys[i]:
+                p += 1
+                _swap(keys, values, p, i)
+            if i >= j:
+                break
+            _swap(keys, values, i, j)
+            if not keys[i] < pivot and not pivot < keys[i]:
+                p += 1
+                _swap(keys, values, p, i)
+            if not keys[j] < pivot and not pivot < keys[j]:
+                q -= 1
+                _swap(keys, values, q, j)
+        i = j + 1
+        for k in range(lo, p + 1):
+            _swap(keys, values, k, j)
+            j -= 1
+        for k in range(hi, q - 1, -1):
+            _swap(keys, values, k, i)
+            i += 1
+        # now keys[lo:j + 1] < pivot, keys[j + 1:i] == pivot, keys[i:hi + 1] > pivot
+
+        # the smaller part is taken first, so the stack stays O(log n)
+        if j - lo < hi - i:
+            stack.append((i, hi, depth - 1))
+            stack.append((lo, j, depth - 1))
+        else:
+            stack.append((lo, j, depth - 1))
+            stack.append((i, hi, depth - 1))
+    return lst
+
+
+def quick_sort(lst, key=None):
     """
     Sorts a list using the Quick Sort algorithm.
 
     Args:
         lst: A list of integers.
+        key: Optional function of one argument used to extract the
+            comparison key from every element.
 
     Returns:
         List[int]: A new sorted list.
@@ -146,37 +431,28 @@ def quick_sort(lst):
         [2, 3, 5, 10]
         >>> quick_sort([])
         []
+        >>> quick_sort([(1, 'b'), (0, 'a')], key=lambda pair: pair[1])
+        [(0, 'a'), (1, 'b')]
     """
-    if len(lst) == 0 or len(lst) == 1:
-        return lst
-    pivot = random.sample(lst, 1)[0]
-    left, right = [], []
-    counter = 0
-    for elem in lst:
-        if elem < pivot:
-            left.append(elem)
-        elif elem > pivot:
-            right.append(elem)
-        else:
-            counter += 1
-    left = quick_sort(left)
-    right = quick_sort(right)
-
-    return left + [pivot] * counter + right
+    return quick_sort_inplace(list(lst), key)
 
-quick_srt = quick_sort(unsorted)
-print("Quick sort:")
-print(quick_srt)
 
 # def quick_sort2(lst):
 #     return quick_sort2([el for el in lst if el < el[0]]) + lst.count
 
-def merge_sort(lst):
+def merge_sort(lst, key=None):
     """
     Sorts a list using the Merge Sort algorithm.
 
+    The sort is bottom-up: short runs are sorted by insertion and then
+    merged pairwise between the list and a single auxiliary buffer, so no
+    slices are made on every level and there is no recursion. The sort
+    is stable.
+
     Args:
         lst: A list of integers.
+        key: Optional function of one argument used to extract the
+            comparison key from every element.
 
     Returns:
         List[int]: A new sorted list.
@@ -186,19 +462,107 @@ def merge_sort(lst):
         [3, 9, 10, 27, 38, 43, 82]
         >>> merge_sort([5, 4, 3, 2, 1])
         [1, 2, 3, 4, 5]
+        >>> merge_sort(['bb', 'a', 'cc', 'b'], key=len)
+        ['a', 'b', 'bb', 'cc']
+        >>> data = [i % 97 for i in range(1000)]
+        >>> merge_sort(data) == sorted(data)
+        True
+    """
+    if key is not None:
+        decorated = [(key(elem), i, elem) for i, elem in enumerate(lst)]
+        return [elem for _, _, elem in merge_sort(decorated)]
+
+    src = list(lst)
+    size = len(src)
+    for lo in range(0, size, MIN_RUN):
+        _insertion_sort_range(src, None, lo, min(lo + MIN_RUN, size) - 1)
+
+    dst = [None] * size
+    width = MIN_RUN
+    while width < size:
+        for lo in range(0, size, 2 * width):
+            _merge_runs(src, dst, lo, min(lo + width, size), min(lo + 2 * width, size))
+        src, dst = dst, src
+        width *= 2
+    return src
+
+
+def _next_gallop(gallop, copied):
     """
-    if len(lst) <= 1:
-        return lst
+    Helper function for _merge_runs. Returns the number of wins in a row
+    needed before the next gallop: fewer if the last gallop copied a long
+    stretch, more if it did not pay off.
 
-    mid = len(lst) // 2
+    >>> _next_gallop(7, 100), _next_gallop(7, 2)
+    (6, 8)
+    """
+    if copied >= MIN_GALLOP:
+        return max(2, gallop - 1)
+    return gallop + 1
 
-    left_half = lst[:mid]
-    right_half = lst[mid:]
 
-    left = merge_sort(left_half)
-    right = merge_sort(right_half)
+def _merge_runs(src, dst, lo, mid, hi):
+    """
+    Helper function for merge_sort. Merges the sorted runs src[lo:mid] and
+    src[mid:hi] into dst[lo:hi].
+
+    The part of the left run that is not greater than the first element of
+    the right run, and the part of the right run that is not less than the
+    last element of the left run, are already in place; they are found by
+    binary search and copied as a whole. Inside the merge, once one run
+    has won MIN_GALLOP times in a row (adjusted by _next_gallop), the rest of its winning stretch is
+    found by binary search and copied at once (galloping), so runs that
+    are already ordered against each other cost O(log n) comparisons.
+
+    >>> dst = [None] * 6
+    >>> _merge_runs([1, 2, 5, 3, 6, 7], dst, 0, 3, 6)
+    >>> dst
+    [1, 2, 3, 5, 6, 7]
+    """
+    if mid >= hi or not src[mid] < src[mid - 1]:
+        dst[lo:hi] = src[lo:hi]
+        return
+
+    start = bisect_right(src, src[mid], lo, mid)
+    end = bisect_left(src, src[mid - 1], mid, hi)
+    dst[lo:start] = src[lo:start]
+    dst[end:hi] = src[end:hi]
+
+    left, right, k = start, mid, start
+    left_wins = right_wins = 0
+    gallop = MIN_GALLOP
+    while left < mid and right < end:
+        if src[right] < src[left]:
+            dst[k] = src[right]
+            right += 1
+            k += 1
+            right_wins += 1
+            left_wins = 0
+            if right_wins >= gallop:
+                stop = bisect_left(src, src[left], right, end)
+                dst[k:k + stop - right] = src[right:stop]
+                k += stop - right
+                gallop = _next_gallop(gallop, stop - right)
+                right = stop
+                right_wins = 0
+        else:
+            dst[k] = src[left]
+            left += 1
+            k += 1
+            left_wins += 1
+            right_wins = 0
+            if left_wins >= gallop:
+                # Equal elements of the left run go first to keep the sort stable.
+                stop = bisect_right(src, src[right], left, mid)
+                dst[k:k + stop - left] = src[left:stop]
+                k += stop - left
+                gallop = _next_gallop(gallop, stop - left)
+                left = stop
+                left_wins = 0
+    dst[k:k + mid - left] = src[left:mid]
+    k += mid - left
+    dst[k:end] = src[right:end]
 
-    return merge(left, right)
 
 def merge(left, right):
     """
@@ -211,21 +575,110 @@ def merge(left, right):
     sorted_list = []
     l = 0 # індекс для left
     r = 0 # індекс для right
-    while l < len(left) and r < len(right):
-        if left[l] < right[r]:
-            sorted_list.append(left[l])
-            l += 1
-        else:
+    len_left = len(left)
+    len_right = len(right)
+    while l < len_left and r < len_right:
+        if right[r] < left[l]:
             sorted_list.append(right[r])
             r += 1
+        else:
+            sorted_list.append(left[l])
+            l += 1
     sorted_list.extend(left[l:])
     sorted_list.extend(right[r:])
     return sorted_list
 
-unsorted = [38, 27, 43, 3, 9, 82, 10]
-merge_srt = merge_sort(unsorted)
-print("Merge sort:")
-print(merge_srt)
+
+def external_merge_sort(input_path, output_path, max_lines=1_000_000, key=None,
+                        fan_in=64):
+    """
+    Sorts the lines of a file which may be larger than memory.
+
+    The file is read by chunks of max_lines lines, every chunk is sorted
+    with merge_sort and spilled to a temporary file. The sorted runs are
+    then merged by fan_in files at a time with heapq.merge until the
+    output file is written. The sort is stable.
+
+    Args:
+        input_path: Path to the file with records, one per line.
+        output_path: Path to the file for the sorted records.
+        max_lines: Number of lines that are sorted in memory at once.
+        key: Optional function of one argument (a line without the line
+            break) used to extract the comparison key.
+        fan_in: Maximal number of runs that are merged at once.
+
+    Examples:
+        >>> import os, tempfile
+        >>> folder = tempfile.mkdtemp()
+        >>> source = os.path.join(folder, 'in.txt')
+        >>> target = os.path.join(folder, 'out.txt')
+        >>> with open(source, 'w', encoding='utf-8') as file:
+        ...     _ = file.write('\\n'.join(str(i * 37 % 101) for i in range(101)))
+        >>> external_merge_sort(source, target, max_lines=10, key=int, fan_in=3)
+        >>> with open(target, encoding='utf-8') as file:
+        ...     [int(line) for line in file] == list(range(101))
+        True
+        >>> with open(source, 'w', encoding='utf-8') as file:
+        ...     _ = file.write('a\\tb\\na\\nab\\n')
+        >>> external_merge_sort(source, target, max_lines=2)
+        >>> with open(target, encoding='utf-8') as file:
+        ...     file.read().splitlines()
+        ['a', 'a\\tb', 'ab']
+        >>> import shutil
+        >>> shutil.rmtree(folder)
+    """
+    # Lines are always compared without the line break, which would
+    # otherwise sort before characters such as a tab.
+    if key is None:
+        def line_key(line):
+            return line.rstrip('\n')
+    else:
+        def line_key(line):
+            return key(line.rstrip('\n'))
+
+    with tempfile.TemporaryDirectory() as folder:
+        runs = []
+        with open(input_path, 'r', encoding='utf-8') as file:
+            while True:
+                chunk = list(islice(file, max_lines))
+                if not chunk:
+                    break
+                if not chunk[-1].endswith('\n'):
+                    chunk[-1] += '\n'
+                runs.append(_write_run(folder, len(runs), merge_sort(chunk, line_key)))
+
+        while len(runs) > fan_in:
+            merged = []
+            for i in range(0, len(runs), fan_in):
+                merged.append(_merge_files(runs[i:i + fan_in],
+                                           os.path.join(folder, f'merged_{len(runs)}_{i}'),
+                                           line_key))
+            runs = merged
+        _merge_files(runs, output_path, line_key)
+
+
+def _write_run(folder, number, lines):
+    """
+    Helper function for external_merge_sort. Writes a sorted run to a file.
+    """
+    path = os.path.join(folder, f'run_{number}')
+    with open(path, 'w', encoding='utf-8') as file:
+        file.writelines(lines)
+    return path
+
+
+def _merge_files(paths, output_path, key):
+    """
+    Helper function for external_merge_sort. Merges sorted files into one.
+    """
+    files = [open(path, 'r', encoding='utf-8') for path in paths]
+    try:
+        with open(output_path, 'w', encoding='utf-8') as file_out:
+            file_out.writelines(heapq.merge(*files, key=key))
+    finally:
+        for file in files:
+            file.close()
+    return output_path
 
 
 def insertion_sort(lst):
@@ -255,11 +708,33 @@ def insertion_sort(lst):
         lst[j + 1] = temp
     return lst
 
-insert_srt = insertion_sort(unsorted)
-print("Insertion sort:")
-print(insert_srt)
+
+def demo():
+    """Runs every algorithm on the demo data and prints the results."""
+    print("Linear search:")
+    print(linear_search([2, 3, 4, 5], 4))
+
+    unsorted = [9, 1, 8, 2, 7, 3, 6, 4, 5]
+    print("Unsorted:")
+    print(unsorted)
+    print("Selection sort:")
+    print(selection_sort(unsorted))
+
+    print("Binary search:")
+    print(binary_search([2, 3, 4, 5], 3))
+
+    print("Quick sort:")
+    print(quick_sort(unsorted))
+
+    unsorted = [38, 27, 43, 3, 9, 82, 10]
+    print("Merge sort:")
+    print(merge_sort(unsorted))
+
+    print("Insertion sort:")
+    print(insertion_sort(unsorted))
 
 
 if __name__ == "__main__":
+    demo()
     import doctest
     print(doctest.testmod())
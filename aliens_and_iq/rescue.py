@@ -1,4 +1,7 @@
 """Aliens and IQ"""
+from bisect import bisect_left, bisect_right, insort
+
+
 def read_file(file_path):
     """Read file and return info.
 
@@ -25,13 +28,220 @@ def read_file(file_path):
     return info
 
 
-def rescue_people(smarties, limit_iq):
+def _find_left(next_left, position):
+    """Return the first position >= position whose person has not been rescued yet.
+
+    >>> _find_left([1, 2, 2, 4, 4], 0)
+    2
+    """
+    root = position
+    while next_left[root] != root:
+        root = next_left[root]
+    while next_left[position] != root:
+        next_left[position], position = root, next_left[position]
+    return root
+
+
+def _first_fit(sorted_smarties, limit_iq):
+    """Fill journeys one by one, taking everyone who still fits (first-fit decreasing).
+
+    >>> _first_fit([('A', 4), ('B', 3), ('C', 2), ('D', 1)], 5)
+    [['A', 'D'], ['B', 'C']]
+    """
+    neg_iqs = [-iq for _, iq in sorted_smarties]
+    size = len(sorted_smarties)
+    # next_left[i] leads to the first person at position >= i still on Earth.
+    next_left = list(range(size + 1))
+
+    journeys = []
+    first = _find_left(next_left, 0)
+    while first < size:
+        name, iq = sorted_smarties[first]
+        next_left[first] = first + 1
+        rest = limit_iq - iq
+        journey = [name]
+        position = first + 1
+        while True:
+            # The first person left who fits: everyone before bisect_left is too smart.
+            position = _find_left(next_left, max(position, bisect_left(neg_iqs, -rest)))
+            if position == size:
+                break
+            name, iq = sorted_smarties[position]
+            journey.append(name)
+            rest -= iq
+            next_left[position] = position + 1
+            position += 1
+        journeys.append(journey)
+        first = _find_left(next_left, first)
+
+    return journeys
+
+
+class _FreeIndex:
+    """Sorted (free IQ, journey number) pairs of the open journeys.
+
+    The pairs are kept in sorted buckets of at most 2 * BUCKET_SIZE pairs with
+    the largest pair of every bucket in maxes, so finding a bucket is a bisect
+    and an insert or a removal moves only one bucket: O(log J + BUCKET_SIZE)
+    per operation plus O(J / BUCKET_SIZE) when a bucket is split or dropped,
+    instead of O(J) for a single sorted list of J journeys.
+
+    >>> index = _FreeIndex()
+    >>> for pair in [(5, 0), (2, 1), (7, 2)]:
+    ...     index.add(pair)
+    >>> index.pop_fitting(3), index.pop_fitting(3), index.pop_fitting(3)
+    ((5, 0), (7, 2), None)
+    """
+
+    def __init__(self):
+        self.buckets = []
+        self.maxes = []
+
+    def add(self, pair):
+        """Add a (free IQ, journey number) pair."""
+        if not self.buckets:
+            self.buckets.append([pair])
+            self.maxes.append(pair)
+            return
+        number = min(bisect_left(self.maxes, pair), len(self.buckets) - 1)
+        bucket = self.buckets[number]
+        insort(bucket, pair)
+        self.maxes[number] = bucket[-1]
+        if len(bucket) > 2 * BUCKET_SIZE:
+            self.buckets[number:number + 1] = [bucket[:BUCKET_SIZE], bucket[BUCKET_SIZE:]]
+            self.maxes.insert(number, bucket[BUCKET_SIZE - 1])
+
+    def pop_fitting(self, iq):
+        """Remove and return the pair with the least free IQ that is at least iq
+        (the first journey among equal ones), or None if no journey has room."""
+        number = bisect_left(self.maxes, (iq, -1))
+        if number == len(self.buckets):
+            return None
+        bucket = self.buckets[number]
+        pair = bucket.pop(bisect_left(bucket, (iq, -1)))
+        if bucket:
+            self.maxes[number] = bucket[-1]
+        else:
+            del self.buckets[number]
+            del self.maxes[number]
+        return pair
+
+
+def _best_fit(sorted_smarties, limit_iq):
+    """Put every person into the journey with the least free IQ that still fits
+    (best-fit decreasing). The open journeys are kept in a _FreeIndex.
+
+    >>> _best_fit([('A', 5), ('B', 4), ('C', 3), ('D', 3), ('E', 3), ('F', 2)], 10)
+    [['A', 'B'], ['C', 'D', 'E'], ['F']]
+    """
+    journeys = []
+    free = _FreeIndex()
+    for name, iq in sorted_smarties:
+        pair = free.pop_fitting(iq)
+        if pair is not None:
+            rest, number = pair
+            journeys[number].append(name)
+        else:
+            rest, number = limit_iq, len(journeys)
+            journeys.append([name])
+        free.add((rest - iq, number))
+    return journeys
+
+
+def _exact(sorted_smarties, limit_iq):
+    """Find the smallest number of journeys with branch and bound.
+    People whose IQ is above limit_iq travel alone.
+
+    >>> _exact([('A', 5), ('B', 4), ('C', 3), ('D', 3), ('E', 3), ('F', 2)], 10)
+    [['A', 'C', 'F'], ['B', 'D', 'E']]
+    """
+    if len(sorted_smarties) > EXACT_LIMIT:
+        raise ValueError(f'exact strategy supports at most {EXACT_LIMIT} people')
+
+    alone = [[name] for name, iq in sorted_smarties if iq > limit_iq]
+    people = [(name, iq) for name, iq in sorted_smarties if iq <= limit_iq]
+    # suffix[i] is the total IQ of people from position i on.
+    suffix = [0] * (len(people) + 1)
+    for i in range(len(people) - 1, -1, -1):
+        suffix[i] = suffix[i + 1] + people[i][1]
+    # smallest_sums[k] is the total IQ of the k least smart people,
+    # so free IQ rest takes at most bisect_right(smallest_sums, rest) - 1 more people.
+    smallest_sums = [0]
+    for _, iq in reversed(people):
+        smallest_sums.append(smallest_sums[-1] + iq)
+    per_journey = bisect_right(smallest_sums, limit_iq) - 1
+
+    best = _first_fit(people, limit_iq)
+    journeys = []
+    rests = []
+
+    def search(i):
+        nonlocal best
+        if i == len(people):
+            if len(journeys) < len(best):
+                best = [list(journey) for journey in journeys]
+            return
+        # Lower bound: free IQ smaller than the least smart person left is wasted,
+        # the rest of the people need at least this many new journeys.
+        smallest = people[-1][1]
+        spare = suffix[i] - sum(rest for rest in rests if rest >= smallest)
+        needed = -(-spare // limit_iq) if spare > 0 else 0
+        # Lower bound: the people left who do not fit into open journeys by count.
+        over = len(people) - i - sum(bisect_right(smallest_sums, rest) - 1 for rest in rests)
+        if over > 0:
+            needed = max(needed, -(-over // per_journey))
+        if len(journeys) + needed >= len(best):
+            return
+
+        name, iq = people[i]
+        if iq in rests:
+            # Filling a journey exactly is never worse than any other choice.
+            candidates = [rests.index(iq)]
+        else:
+            candidates = sorted(range(len(rests)), key=rests.__getitem__)
+        tried = set()
+        for number in candidates:
+            rest = rests[number]
+            if iq <= rest and rest not in tried:
+                tried.add(rest)
+                journeys[number].append(name)
+                rests[number] -= iq
+                search(i + 1)
+                rests[number] += iq
+                journeys[number].pop()
+        if len(journeys) + 1 < len(best):
+            journeys.append([name])
+            rests.append(limit_iq - iq)
+            search(i + 1)
+            rests.pop()
+            journeys.pop()
+
+    search(0)
+    return alone + best
+
+
+# Largest number of people for the exact strategy.
+EXACT_LIMIT = 16
+# Usual number of open journeys in a bucket of _FreeIndex.
+BUCKET_SIZE = 512
+STRATEGIES = {
+    'first_fit': _first_fit,
+    'best_fit': _best_fit,
+    'exact': _exact,
+}
+
+
+def rescue_people(smarties, limit_iq, strategy='first_fit'):
     """Plan evacuation trips for smart people given an IQ limit per trip.
 
     Args:
         smarties(dict): Result of read_file(). Dictionary where the key is name
                         of the smartest people and the value is their IQ level.
         limit_iq(int): The maximum total IQ level of people who can be on board.
+        strategy(str): How to pack people into journeys:
+                       'first_fit' fills journeys one by one (the aliens' choice),
+                       'best_fit' puts everyone into the fullest journey with room,
+                       'exact' finds the fewest journeys (at most EXACT_LIMIT people).
 
     Returns:
         tuple[int, list]: A tuple where first element is the number of needed journeys
@@ -41,24 +251,17 @@ def rescue_people(smarties, limit_iq):
     >>> rescue_people({"Steve Jobs": 160, "Albert Einstein": 160, "Sir Isaac Newton": 195,
     ...                 "Nikola Tesla": 189}, 500)
     (2, [['Sir Isaac Newton', 'Nikola Tesla'], ['Albert Einstein', 'Steve Jobs']])
+    >>> rescue_people({'A': 5, 'B': 4, 'C': 3, 'D': 3, 'E': 3, 'F': 2}, 10, 'exact')
+    (2, [['A', 'C', 'F'], ['B', 'D', 'E']])
+    >>> rescue_people({'A': 5}, 10, 'worst_fit')
+    Traceback (most recent call last):
+    ...
+    ValueError: unknown strategy 'worst_fit'
     """
+    if strategy not in STRATEGIES:
+        raise ValueError(f'unknown strategy {strategy!r}')
     sorted_smarties = sorted(smarties.items(), key=lambda x: (-x[1], x[0]))
-
-    journeys = []
-    while sorted_smarties:
-        name, iq = sorted_smarties.pop(0)
-        rest = limit_iq - iq
-        journey = [name]
-        next_journey = []
-        for name, iq in sorted_smarties:
-            if iq <= rest:
-                journey.append(name)
-                rest -= iq
-            else:
-                next_journey.append((name, iq))
-        sorted_smarties = next_journey
-        journeys.append(journey)
-
+    journeys = STRATEGIES[strategy](sorted_smarties, limit_iq)
     return (len(journeys), journeys)
 
 
@@ -0,0 +1,201 @@
+"""Reproducible benchmark of the packing strategies from rescue.py
+
+Every strategy is run on the same generated IQ distributions and the number
+of journeys, the time and the peak memory are reported together with a lower
+bound on the number of journeys. The JSON report has the same fields as
+the one of sort_benchmark.py (including the commit), plus limit_iq.
+
+The script imports rescue as a top-level module, so run it from the
+aliens_and_iq folder:
+
+    cd aliens_and_iq
+    python rescue_benchmark.py --sizes 10 1000 100000 --output bench.json
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import time
+import tracemalloc
+
+import rescue
+
+
+def uniform_iqs(size: int, rng: random.Random) -> dict[str, int]:
+    """
+    Returns people with IQ spread evenly between 80 and 200.
+
+    >>> uniform_iqs(3, random.Random(0))
+    {'person 0': 188, 'person 1': 129, 'person 2': 177}
+    """
+    return {f'person {i}': rng.randint(80, 200) for i in range(size)}
+
+
+def normal_iqs(size: int, rng: random.Random) -> dict[str, int]:
+    """
+    Returns people with normally distributed IQ (mean 100, deviation 15).
+
+    >>> min(normal_iqs(1000, random.Random(0)).values()) >= 1
+    True
+    """
+    return {f'person {i}': max(1, round(rng.gauss(100, 15))) for i in range(size)}
+
+
+def bimodal_iqs(size: int, rng: random.Random) -> dict[str, int]:
+    """
+    Returns a mix of geniuses (IQ about 180) and ordinary people (IQ about 100).
+
+    >>> geniuses = sum(iq > 140 for iq in bimodal_iqs(1000, random.Random(0)).values())
+    >>> 250 < geniuses < 350
+    True
+    """
+    return {f'person {i}': round(rng.gauss(180 if rng.random() < 0.3 else 100, 10))
+            for i in range(size)}
+
+
+def tight_iqs(size: int, rng: random.Random) -> dict[str, int]:
+    """
+    Returns people whose IQ is just above a quarter of the default limit,
+    so that three of them fit into a journey but four do not.
+
+    >>> iqs = tight_iqs(1000, random.Random(0)).values()
+    >>> min(iqs), max(iqs)
+    (126, 166)
+    """
+    return {f'person {i}': rng.randint(126, 166) for i in range(size)}
+
+
+DISTRIBUTIONS = {
+    'uniform': uniform_iqs,
+    'normal': normal_iqs,
+    'bimodal': bimodal_iqs,
+    'tight': tight_iqs,
+}
+
+
+def lower_bound(smarties: dict[str, int], limit_iq: int) -> int:
+    """
+    Returns the least possible number of journeys by the total IQ.
+
+    >>> lower_bound({'A': 300, 'B': 300, 'C': 100}, 500)
+    2
+    """
+    return -(-sum(smarties.values()) // limit_iq)
+
+
+def measure(strategy: str, smarties: dict[str, int], limit_iq: int, repeat: int = 3) -> dict:
+    """
+    Runs the strategy on smarties and returns the number of journeys,
+    the best time in seconds and the peak memory in bytes.
+
+    >>> result = measure('first_fit', {'A': 300, 'B': 300, 'C': 100}, 500, repeat=1)
+    >>> sorted(result), result['journeys']
+    (['journeys', 'peak_memory', 'time'], 2)
+    """
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        journeys, _ = rescue.rescue_people(smarties, limit_iq, strategy)
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+
+    tracemalloc.start()
+    try:
+        rescue.rescue_people(smarties, limit_iq, strategy)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {'journeys': journeys, 'time': best, 'peak_memory': peak}
+
+
+def _commit() -> str | None:
+    try:
+        result = subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True,
+                                check=True, cwd=os.path.dirname(os.path.abspath(__file__)))
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return result.stdout.strip()
+
+
+def run_benchmarks(strategies: list[str], distributions: list[str], sizes: list[int],
+                   limit_iq: int = 500, seed: int = 0, repeat: int = 3) -> dict:
+    """
+    Benchmarks every strategy on every distribution and size.
+
+    The people of every distribution and size come from
+    random.Random(f'{seed}-{size}'), so a report can be reproduced from its
+    seed. The exact strategy is skipped for sizes above rescue.EXACT_LIMIT.
+
+    >>> report = run_benchmarks(['best_fit', 'exact'], ['tight'], [10, 20], repeat=1)
+    >>> sorted(report)
+    ['commit', 'limit_iq', 'platform', 'python', 'repeat', 'results', 'seed']
+    >>> [(r['strategy'], r['size'], r.get('skipped', False)) for r in report['results']]
+    [('best_fit', 10, False), ('exact', 10, False), ('best_fit', 20, False), ('exact', 20, True)]
+    """
+    results = []
+    for distribution in distributions:
+        for size in sizes:
+            smarties = DISTRIBUTIONS[distribution](size, random.Random(f'{seed}-{size}'))
+            bound = lower_bound(smarties, limit_iq)
+            for strategy in strategies:
+                row = {'strategy': strategy, 'distribution': distribution, 'size': size,
+                       'lower_bound': bound}
+                if strategy == 'exact' and size > rescue.EXACT_LIMIT:
+                    row['skipped'] = True
+                else:
+                    row.update(measure(strategy, smarties, limit_iq, repeat))
+                results.append(row)
+
+    return {
+        'seed': seed,
+        'repeat': repeat,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'commit': _commit(),
+        'limit_iq': limit_iq,
+        'results': results,
+    }
+
+
+def print_report(report: dict) -> None:
+    """Prints the results as a table."""
+    print(f"{'strategy':<11}{'distribution':<14}{'size':>9}{'bound':>9}"
+          f"{'journeys':>10}{'time, s':>12}{'peak, KiB':>11}")
+    for row in report['results']:
+        start = (f"{row['strategy']:<11}{row['distribution']:<14}{row['size']:>9}"
+                 f"{row['lower_bound']:>9}")
+        if row.get('skipped'):
+            print(start + f"{'skipped':>10}")
+        else:
+            print(start + f"{row['journeys']:>10}{row['time']:>12.6f}"
+                  f"{row['peak_memory'] / 1024:>11.1f}")
+
+
+def main():
+    """Parses the command line arguments and runs the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--strategies', nargs='+', choices=list(rescue.STRATEGIES),
+                        default=list(rescue.STRATEGIES))
+    parser.add_argument('--distributions', nargs='+', choices=list(DISTRIBUTIONS),
+                        default=list(DISTRIBUTIONS))
+    parser.add_argument('--sizes', nargs='+', type=int, default=[10, 1000, 100000])
+    parser.add_argument('--limit-iq', type=int, default=500)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--output', help='path of the JSON file with results')
+    args = parser.parse_args()
+
+    report = run_benchmarks(args.strategies, args.distributions, args.sizes,
+                            args.limit_iq, args.seed, args.repeat)
+    print_report(report)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            json.dump(report, file, indent=2)
+
+
+if __name__ == '__main__':
+    main()
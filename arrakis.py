@@ -1,4 +1,11 @@
 """Arracis"""
+import re
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
 def transform_ticket(ticket: str) -> tuple[int] | None:
     """ Parse a railway ticket code and convert it into a tuple containing
     (car_number, compartment_number, seat_number).
@@ -20,40 +27,177 @@ def transform_ticket(ticket: str) -> tuple[int] | None:
     >>> transform_ticket("ГГГГГГГЛЛП")
     (1, 1, 2)
     """
-    if not isinstance(ticket, str) or len(ticket) != 10:
+    code = ticket_code(ticket)
+    if code is None:
         return None
-    if not all(ch in ("Г", "Х") for ch in ticket[:7]):
+    return _decode(code)
+
+
+TICKET_PATTERN = re.compile('[ГХ]{7}[ЛП]{3}')
+TICKET_BITS = str.maketrans('ГХЛП', '0101')
+SEATS = 8
+COMPARTMENTS = 8
+CARRIAGES = 16
+
+
+def ticket_code(ticket: str) -> int | None:
+    """ Convert a ticket into its 10-bit number: Г and Л are 0, Х and П are 1.
+    The first 7 bits are the number of the compartment in the whole train,
+    the last 3 are the seat in it.
+
+    >>> ticket_code("ГГХГХХГЛЛП")
+    177
+    >>> ticket_code("ГГХГХХЛЛГП")
+    """
+    if not isinstance(ticket, str) or not TICKET_PATTERN.fullmatch(ticket):
         return None
-    if not all(ch in ("Л", "П") for ch in ticket[7:]):
+    return int(ticket.translate(TICKET_BITS), 2)
+
+
+def _line_code(ticket) -> int | None:
+    """ ticket_code of a ticket that may end with a line break ("\\n" or "\\r\\n");
+    anything that is not a string is passed to ticket_code unchanged.
+
+    >>> _line_code("ГГХГХХГЛЛП\\r\\n"), _line_code(None)
+    (177, None)
+    """
+    if isinstance(ticket, str):
+        ticket = ticket.rstrip('\r\n')
+    return ticket_code(ticket)
+
+
+def _decode(code: int) -> tuple[int, int, int]:
+    """ Split a ticket number into 1-based (carriage, compartment, seat).
+
+    >>> _decode(177)
+    (3, 7, 2)
+    """
+    compartment, seat = divmod(code, SEATS)
+    carriage, compartment = divmod(compartment, COMPARTMENTS)
+    return (carriage + 1, compartment + 1, seat + 1)
+
+
+def transform_tickets(tickets) -> tuple:
+    """ Decode many tickets at once.
+
+    Args:
+        tickets (Iterable[str]): Ticket codes, e.g. a list or an open file
+            with one ticket per line (line breaks are ignored).
+
+    Returns:
+        tuple: Arrays of carriages, compartments and seats (NumPy arrays if
+            NumPy is available, lists otherwise). An invalid ticket, for
+            which transform_ticket returns None, gets 0 in all three.
+
+    >>> carriages, compartments, seats = transform_tickets(["ГГХГХХГЛЛП", "bad", "ХХХХХХХЛЛП"])
+    >>> [int(x) for x in carriages], [int(x) for x in compartments], [int(x) for x in seats]
+    ([3, 0, 16], [7, 0, 8], [2, 0, 2])
+    >>> [[int(x) for x in part] for part in transform_tickets(["ГГХГХХГЛЛП\\r\\n", None])]
+    [[3, 0], [7, 0], [2, 0]]
+    """
+    codes = [_line_code(ticket) for ticket in tickets]
+    if np is not None:
+        array = np.array([-1 if code is None else code for code in codes], dtype=np.int64)
+        valid = array >= 0
+        compartment, seat = np.divmod(array, SEATS)
+        carriage, compartment = np.divmod(compartment, COMPARTMENTS)
+        return (np.where(valid, carriage + 1, 0), np.where(valid, compartment + 1, 0),
+                np.where(valid, seat + 1, 0))
+
+    decoded = [(0, 0, 0) if code is None else _decode(code) for code in codes]
+    if not decoded:
+        return [], [], []
+    carriages, compartments, seats = map(list, zip(*decoded))
+    return carriages, compartments, seats
+
+
+def transform_ticket_file(path: str) -> tuple:
+    """ Decode all tickets from a file with one ticket per line,
+    see transform_tickets.
+    """
+    with open(path, 'r', encoding='utf-8') as file:
+        return transform_tickets(file)
+
+
+class SeatOccupancy:
+    """ Taken seats of the train as a 1024-bit set: the bit number
+    ticket_code(ticket) is set when the seat of the ticket is taken
+    (16 carriages x 8 compartments x 8 seats, 64 bits per carriage).
+
+    >>> train = SeatOccupancy(["ГГГГГГГЛЛЛ", "ГГГГГГГЛЛП", "ГГГГГГГЛПП", "bad"])
+    >>> train.carriage_load(1), train.carriage_load(2)
+    (3, 0)
+    >>> train.is_free(1, 1, 2), train.is_free(1, 1, 3)
+    (False, True)
+    >>> train.free_seats(1)[:3]
+    [(1, 3), (1, 5), (1, 6)]
+    >>> train.missing_seat()
+    (1, 1, 3)
+    """
+    CARRIAGE_SEATS = COMPARTMENTS * SEATS
+    CARRIAGE_MASK = (1 << CARRIAGE_SEATS) - 1
+    TRAIN_MASK = (1 << CARRIAGES * CARRIAGE_SEATS) - 1
+
+    def __init__(self, tickets=()):
+        self.taken = 0
+        self.add_tickets(tickets)
+
+    def add_ticket(self, ticket: str) -> bool:
+        """ Mark the seat of the ticket as taken.
+        Returns False if the ticket is invalid.
+        """
+        code = ticket_code(ticket)
+        if code is None:
+            return False
+        self.taken |= 1 << code
+        return True
+
+    def add_tickets(self, tickets) -> int:
+        """ Mark the seats of many tickets (e.g. lines of an open file) as
+        taken. Returns the number of valid tickets.
+        """
+        taken = self.taken
+        count = 0
+        for ticket in tickets:
+            code = _line_code(ticket)
+            if code is not None:
+                taken |= 1 << code
+                count += 1
+        self.taken = taken
+        return count
+
+    def _carriage(self, carriage: int) -> int:
+        return (self.taken >> (carriage - 1) * self.CARRIAGE_SEATS) & self.CARRIAGE_MASK
+
+    def is_free(self, carriage: int, compartment: int, seat: int) -> bool:
+        """ Check whether the seat is free. """
+        code = ((carriage - 1) * COMPARTMENTS + compartment - 1) * SEATS + seat - 1
+        return not self.taken >> code & 1
+
+    def carriage_load(self, carriage: int) -> int:
+        """ Return the number of taken seats in the carriage. """
+        return self._carriage(carriage).bit_count()
+
+    def free_seats(self, carriage: int) -> list[tuple[int, int]]:
+        """ Return (compartment, seat) of all free seats in the carriage. """
+        free = ~self._carriage(carriage) & self.CARRIAGE_MASK
+        seats = []
+        while free:
+            lowest = free & -free
+            seats.append(divmod(lowest.bit_length() - 1, SEATS))
+            free ^= lowest
+        return [(compartment + 1, seat + 1) for compartment, seat in seats]
+
+    def missing_seat(self) -> tuple[int, int, int] | None:
+        """ Find the missing seat: the only free seat whose both neighbours
+        (by ticket number) are taken. Returns None if there is no such seat
+        or there are several of them.
+        """
+        taken = self.taken
+        candidates = ~taken & (taken << 1) & (taken >> 1) & self.TRAIN_MASK
+        if candidates and not candidates & (candidates - 1):
+            return _decode(candidates.bit_length() - 1)
         return None
-    carriages = 16
-    compartments = 128
-    s_comp = 1
-    f_comp = 128
-    s_seat = 1
-    f_seat = 8
-    for ch in ticket[:7]:
-        if ch == 'Г':
-            mid = (s_comp + f_comp) // 2
-            f_comp = mid
-        elif ch == 'Х':
-            mid = (s_comp + f_comp) // 2
-            s_comp = mid+1
-        else:
-            return None
-    for ch in ticket[7:]:
-        if ch == 'Л':
-            mid = (s_seat + f_seat) // 2
-            f_seat = mid
-        elif ch == 'П':
-            mid = (s_seat + f_seat) // 2
-            s_seat = mid + 1
-        else:
-            return None
-
-    carriage = int((f_comp - 1)/ (compartments // carriages) + 1)
-    compartment = (f_comp - 1) % (compartments // carriages) + 1
-    return (carriage, compartment, f_seat)
 
 
 # print(transform_ticket("ГГХГХХГЛЛП"))
@@ -1,6 +1,9 @@
 """ This module provides a function to calculate a mathematical
 expression given as a Ukrainian sentence.
 """
+import operator
+from functools import lru_cache
+
 
 def calculate_expression(expression: str) -> int | str | None:
     """
@@ -34,50 +37,99 @@ def calculate_expression(expression: str) -> int | str | None:
     if not isinstance(expression, str):
         return None
 
-    spased_exp = expression.replace('?', ' ?')
-    words = spased_exp.split()
-    exp_words = words[2:-1]
+    program = compile_expression(' '.join(expression.replace('?', ' ?').split()))
+    if isinstance(program, str):
+        return program
+    total, operations = program
+    for operation, number in operations:
+        total = operation(total, number)
+    return total
+
+
+ERROR_MESSAGE = 'Неправильний вираз!'
+OPERATIONS = {
+    'додати': (operator.add, 1),
+    'плюс': (operator.add, 1),
+    'відняти': (operator.sub, 1),
+    'мінус': (operator.sub, 1),
+    'помножити': (operator.mul, 2),
+    'поділити': (operator.floordiv, 2),
+}
 
 
+@lru_cache(maxsize=1 << 16)
+def compile_expression(phrase: str) -> tuple | str:
+    """
+    Compile a normalised phrase (words separated by single spaces, with
+    '?' as a separate word) into the first number and a tuple of
+    (operation, number) pairs. The result is cached, so a phrase that
+    repeats is tokenised only once.
+
+    param phrase: str, normalised mathematical expression
+    return: tuple, (first number, ((operation, number), ...)),
+            or str with the error message if the phrase is invalid.
+    >>> compile_expression('Скільки буде 8 відняти 3 ?')
+    (8, ((<built-in function sub>, 3),))
+    >>> compile_expression('Скільки буде 8 поділити на 0 ?')
+    'Неправильний вираз!'
+    """
+    words = phrase.split()
+    exp_words = words[2:-1]
+
     try:
         if len(words) < 6 and words[0] != 'Скільки' or words[1] != 'буде' or words[-1] != '?':
-            return 'Неправильний вираз!'
-        # if exp_words[1] == 'в' and exp_words[2] == 'кубі' or exp_words[2] == 'квадраті':
-        #     return 'Неправильний вираз!'
+            return ERROR_MESSAGE
 
-        # if exp_words[0].isdigit is False: # дописати для друго числа
-        #     return 'Неправильний вираз!'
-
-        total = int(exp_words[0])
+        first = int(exp_words[0])
+        operations = []
         i = 1
         while i < len(exp_words):
+            if exp_words[i] not in OPERATIONS:
+                return ERROR_MESSAGE
+            operation, size = OPERATIONS[exp_words[i]]
+            if size == 2 and exp_words[i+1] != 'на':
+                return ERROR_MESSAGE
+            number = int(exp_words[i+size])
+            if operation is operator.floordiv and number == 0:
+                return ERROR_MESSAGE
+            operations.append((operation, number))
+            i += size + 1
+        return first, tuple(operations)
+    except (ValueError, IndexError):
+        return ERROR_MESSAGE
+
 
-            if exp_words[i] == 'додати' or exp_words[i] == 'плюс':
-                total += int(exp_words[i+1])
-                i += 2
-            elif exp_words[i] == 'відняти' or exp_words[i] == 'мінус':
-                total -= int(exp_words[i+1])
-                i += 2
-            elif exp_words[i] == 'помножити':
-                if exp_words[i+1] == 'на':
-                    total *= int(exp_words[i+2])
-                    i += 3
-                else:
-                    return 'Неправильний вираз!'
-            elif exp_words[i] == 'поділити':
-                if exp_words[i+1] == 'на':
-                    num = int(exp_words[i+2])
-                    if num == 0:
-                        raise ValueError('Неправильний вираз!')
-                    total //= num
-                    i += 3
-                else:
-                    return 'Неправильний вираз!'
-            else:
-                raise ValueError('Неправильний вираз!')
-        return total
-    except (ValueError, IndexError, IndexError):
-        return 'Неправильний вираз!'
+def evaluate_many(input_path: str, output_path: str) -> int:
+    """
+    Calculate the expressions from a file, one per line, and write the
+    results to another file, one per line, in the same order.
+
+    param input_path: str, path to the file with expressions
+    param output_path: str, path to the file for the results
+    return: int, the number of calculated expressions
+    >>> import os, shutil, tempfile
+    >>> folder = tempfile.mkdtemp()
+    >>> source = os.path.join(folder, 'expressions.txt')
+    >>> target = os.path.join(folder, 'results.txt')
+    >>> with open(source, 'w', encoding='utf-8') as file:
+    ...     _ = file.write('Скільки буде 8 відняти 3?\\nСкільки буде...\\n')
+    >>> evaluate_many(source, target)
+    2
+    >>> with open(target, encoding='utf-8') as file:
+    ...     print(file.read())
+    5
+    Неправильний вираз!
+    <BLANKLINE>
+    >>> shutil.rmtree(folder)
+    """
+    count = 0
+    with open(input_path, 'r', encoding='utf-8') as file_in, \
+         open(output_path, 'w', encoding='utf-8') as file_out:
+        for line in file_in:
+            result = calculate_expression(line.rstrip('\n'))
+            file_out.write(f'{result}\n')
+            count += 1
+    return count
 
 
 if __name__ == "__main__":
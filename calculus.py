@@ -1,4 +1,98 @@
 """Different calculus functions"""
+import sys
+from concurrent.futures import ProcessPoolExecutor
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+def evaluate(func: callable, points, vectorised: bool | None = None):
+    """Evaluate the function once at every point.
+
+    If points is a NumPy array (or vectorised is True), the function is
+    called once with the whole array; if it does not support array input,
+    it is called point by point.
+
+    Args:
+        func (callable): The function to evaluate.
+        points (list[float] | numpy.ndarray): Points at which to evaluate it.
+        vectorised (bool | None): True to require one call over an array,
+            False to always call point by point, None to decide by points.
+
+    Returns:
+        list | numpy.ndarray: Values of the function at the points.
+
+    Examples:
+    >>> evaluate(lambda x: x ** 2, [1, 2, 3])
+    [1, 4, 9]
+    """
+    if np is not None and (vectorised or vectorised is None and isinstance(points, np.ndarray)):
+        array = np.asarray(points)
+        try:
+            values = np.asarray(func(array))
+        except (TypeError, ValueError):
+            if vectorised:
+                raise
+        else:
+            if values.shape == array.shape:
+                return values
+            if vectorised:
+                raise ValueError('func does not return one value per point')
+        # Call func with Python numbers, as for a list of points.
+        points = array.tolist()
+    return [func(point) for point in points]
+
+
+def find_max(func: callable, points, vectorised: bool | None = None) -> tuple:
+    """Find the maximal value of a function and all points where it is reached,
+    evaluating the function only once per point.
+
+    Args:
+        func (callable): The function to evaluate.
+        points (list[float] | numpy.ndarray): Points at which to evaluate it.
+        vectorised (bool | None): Passed to evaluate().
+
+    Returns:
+        tuple: The maximal value (None if there are no points) and the set of
+               points where the function has it.
+
+    Examples:
+    >>> find_max(lambda x: -x ** 2 + 4*x, [1, 0, 3, -1])
+    (3, {1, 3})
+    >>> find_max(abs, [])
+    (None, set())
+    >>> import math
+    >>> np is None or find_max(math.sin, np.linspace(-3, 3, 7)) == (math.sin(2.0), {2.0})
+    True
+    >>> np is None or type(find_max(math.sin, np.linspace(-3, 3, 7))[1].pop()) is float
+    True
+    >>> np is None or find_max(lambda x: x if x > 0 else -x, np.array([-2.0, 1.0, 2.0]))
+    (2.0, {2.0, -2.0})
+    """
+    values = evaluate(func, points, vectorised)
+    if np is not None and isinstance(values, np.ndarray):
+        if values.size == 0:
+            return None, set()
+        best = values.max()
+        indexes = np.flatnonzero(values == best)
+        if isinstance(points, np.ndarray):
+            return best.item(), set(points[indexes].tolist())
+        return best.item(), {points[i] for i in indexes}
+
+    if np is not None and isinstance(points, np.ndarray):
+        points = points.tolist()
+    best = None
+    best_points = set()
+    for point, value in zip(points, values):
+        if best is None or value > best:
+            best = value
+            best_points = {point}
+        elif value == best:
+            best_points.add(point)
+    return best, best_points
+
+
 def find_max_value(func: callable, points: list[float]) -> float:
     """Find the maximal value of a function at given points.
 
@@ -15,7 +109,7 @@ def find_max_value(func: callable, points: list[float]) -> float:
     >>> find_max_value(lambda x: x ** 2 + x, [1, 2, 3, -1])
     12
     """
-    return round(max(map(func, points)), 2)
+    return round(find_max(func, points)[0], 2)
 
 
 def find_max_points(func: callable, points: list[float]) -> set[float]:
@@ -34,11 +128,7 @@ def find_max_points(func: callable, points: list[float]) -> set[float]:
     >>> find_max_points(lambda x: -x ** 2 + 4*x, [1, 0, 3, -1])
     {1, 3}
     """
-    max_points = set()
-    for point in points:
-        if max(list(map(func, points))) == func(point):
-            max_points.add(point)
-    return max_points
+    return find_max(func, points)[1]
 
 def compute_limit(seq: callable) -> float:
     """Compute the limit of a convergent sequence.
@@ -52,13 +142,69 @@ def compute_limit(seq: callable) -> float:
     Examples:
         >>> compute_limit(lambda n: (n ** 2 + n) / (3*n ** 2))
         0.33
+        >>> compute_limit(lambda n: 1 / n), compute_limit(lambda n: (-1) ** n / n)
+        (0.0, 0.0)
+    """
+    limit, _ = estimate_limit(seq)
+    if limit is None:
+        return None
+    # Adding 0.0 turns -0.0 (a tiny negative estimate of 0) into 0.0.
+    return round(limit, 2) + 0.0
+
+
+def estimate_limit(seq: callable, tol: float = 10**(-3), start: int = 10,
+                   factor: int = 2, max_evaluations: int = 40) -> tuple:
+    """Estimate the limit of a convergent sequence with as few terms as possible.
+
+    The sequence is evaluated once at n = start, start * factor,
+    start * factor ** 2, ... If the error decreases like c / n ** p, it
+    decreases geometrically along this schedule, so Aitken's delta-squared
+    process on the last three terms removes it. The estimation stops as
+    soon as two accelerated estimates differ by at most tol, while the
+    differences between the terms decrease.
+
+    Args:
+        seq (callable): A function representing the sequence.
+        tol (float): The accepted difference between two estimates.
+        start (int): The first n.
+        factor (int): The ratio between two consecutive n.
+        max_evaluations (int): The maximal number of terms to evaluate.
+
+    Returns:
+        tuple: The estimated limit (None if it did not converge) and the
+               number of terms of the sequence that were evaluated.
+
+    Examples:
+        >>> limit, evaluations = estimate_limit(lambda n: (n ** 2 + n) / (3*n ** 2))
+        >>> round(limit, 6), evaluations
+        (0.333333, 4)
+        >>> limit, evaluations = estimate_limit(lambda n: (1 + 1 / n) ** n)
+        >>> round(limit, 3), evaluations
+        (2.718, 5)
+        >>> estimate_limit(lambda n: n, max_evaluations=10)
+        (None, 10)
     """
-    n = 10**5
-    result = seq(n)
-    for _ in range(5):
-        next_result = seq(n)
-        if next_result - result <= 10**(-3):
-            return round(seq(n), 2)
+    terms = []
+    estimates = []
+    n = start
+    while len(terms) < max_evaluations:
+        terms.append(seq(n))
+        n *= factor
+        if len(terms) < 3:
+            continue
+        term_0, term_1, term_2 = terms[-3:]
+        if term_2 != term_1 and abs(term_2 - term_1) >= abs(term_1 - term_0):
+            # the terms do not settle down, so the extrapolation means nothing
+            estimates.clear()
+            continue
+        denominator = term_2 - 2 * term_1 + term_0
+        if denominator == 0:
+            estimates.append(term_2)
+        else:
+            estimates.append(term_2 - (term_2 - term_1) ** 2 / denominator)
+        if len(estimates) >= 2 and abs(estimates[-1] - estimates[-2]) <= tol:
+            return estimates[-1], len(terms)
+    return None, len(terms)
 
 
 
@@ -76,7 +222,71 @@ def compute_derivative(func: callable, x_0: float) -> float:
     >>> compute_derivative(lambda x: x ** 2 + x, 2)
     5.0
     """
-    return round((func(x_0 + 10**(-5)) - func(x_0)) / (10**(-5)), 2)
+    return round(float(compute_derivatives(func, [x_0])[0]), 2)
+
+
+DERIVATIVE_STEP = 10**(-5)
+
+
+def compute_derivatives(func: callable, points, h: float = DERIVATIVE_STEP,
+                        vectorised: bool | None = None):
+    """Compute the derivative of a function at many points with central
+    differences (func(x + h) - func(x - h)) / (2 * h), which are more
+    accurate than forward differences for the same two evaluations.
+
+    For a NumPy array of points, func is evaluated at all the shifted
+    points in one call (see evaluate()).
+
+    Args:
+        func (callable): The function to differentiate.
+        points (list[float] | numpy.ndarray): The points.
+        h (float): The step of the differences.
+        vectorised (bool | None): Passed to evaluate().
+
+    Returns:
+        list[float] | numpy.ndarray: The derivatives at the points.
+
+    Examples:
+    >>> [round(d, 6) for d in compute_derivatives(lambda x: x ** 3, [0, 1, 2])]
+    [0.0, 3.0, 12.0]
+    """
+    if np is not None and (vectorised or vectorised is None and isinstance(points, np.ndarray)):
+        x = np.asarray(points, dtype=float)
+        values = np.asarray(evaluate(func, np.concatenate([x + h, x - h]), vectorised))
+        return (values[:len(x)] - values[len(x):]) / (2 * h)
+    return [(func(x + h) - func(x - h)) / (2 * h) for x in points]
+
+
+def get_tangents(func: callable, points, h: float = DERIVATIVE_STEP,
+                 vectorised: bool | None = None) -> tuple:
+    """Compute the tangent lines y = slope * x + intercept to a function at
+    many points. The function is evaluated at x - h, x and x + h for all
+    points, in one call for a NumPy array of points.
+
+    Args:
+        func (callable): The function.
+        points (list[float] | numpy.ndarray): The points of tangency.
+        h (float): The step of the central differences.
+        vectorised (bool | None): Passed to evaluate().
+
+    Returns:
+        tuple: The slopes and the intercepts (lists, or NumPy arrays for
+               NumPy input), not rounded.
+
+    Examples:
+    >>> slopes, intercepts = get_tangents(lambda x: x ** 2 + x, [2, 0])
+    >>> [round(a, 6) for a in slopes], [round(b, 6) for b in intercepts]
+    ([5.0, 1.0], [-4.0, 0.0])
+    """
+    if np is not None and (vectorised or vectorised is None and isinstance(points, np.ndarray)):
+        x = np.asarray(points, dtype=float)
+        size = len(x)
+        values = np.asarray(evaluate(func, np.concatenate([x + h, x - h, x]), vectorised))
+        slopes = (values[:size] - values[size:2 * size]) / (2 * h)
+        return slopes, values[2 * size:] - slopes * x
+    slopes = compute_derivatives(func, points, h, False)
+    intercepts = [func(x) - slope * x for x, slope in zip(points, slopes)]
+    return slopes, intercepts
 
 
 def get_tangent(func: callable, x_0: float) -> str:
@@ -117,7 +327,7 @@ def get_tangent(func: callable, x_0: float) -> str:
     >>> get_tangent(math.sin, 2)
     '- 0.42 * x + 1.75'
     """
-    derivative = round((func(x_0 + 10**(-5)) - func(x_0)) / (10**(-5)), 2)
+    derivative = compute_derivative(func, x_0)
     # tangent = derivative * (x-x_0) + func(x_0) = derivative * x - derivative * x_0
     a = derivative
     b = - derivative * x_0 + func(x_0)
@@ -169,19 +379,155 @@ def get_root(func: callable, a: float, b: float) -> float:
     3.14
     >>> get_root(lambda x: x**2 + 1, 0, 2)
     """
-    if func(a) * func(b) <= 0:
-        while abs(b - a) > 10**(-5):
-            midpoint = (a + b) / 2
-            if func(midpoint) == 0:
-                return round(midpoint,2)
-
-            if func(a) * func(midpoint) < 0:
-                b = midpoint
+    result = find_root(func, a, b)
+    if result is not None:
+        return round(float(result[0]), 2)
+    return None
+
+
+ROOT_TOLERANCE = 10**(-5)
+
+
+def find_root(func: callable, a: float, b: float, tol: float = ROOT_TOLERANCE,
+              f_a: float | None = None, f_b: float | None = None,
+              max_iter: int = 100) -> tuple[float, int] | None:
+    """Find a root of a function in an interval where it changes sign, with
+    Brent's method: inverse quadratic interpolation or secant steps while
+    they converge, bisection otherwise. Every value of the function is
+    computed once and kept, so only one new evaluation is made per step.
+
+    Args:
+        func (callable): The function to evaluate.
+        a (float): The start of the interval.
+        b (float): The end of the interval.
+        tol (float): The accepted error of the root.
+        f_a (float | None): func(a), if it is already known.
+        f_b (float | None): func(b), if it is already known.
+        max_iter (int): The maximal number of steps.
+
+    Returns:
+        tuple[float, int] | None: The root and the number of evaluations of
+            func made, or None if the function has the same sign at a and b.
+
+    Examples:
+    >>> root, evaluations = find_root(lambda x: x**3 - 2, 0, 2)
+    >>> round(root, 5), evaluations
+    (1.25992, 8)
+    >>> find_root(lambda x: x - 1, 1, 5)
+    (1, 2)
+    >>> find_root(lambda x: x**2 + 1, 0, 2)
+    """
+    evaluations = 0
+    if f_a is None:
+        f_a = func(a)
+        evaluations += 1
+    if f_b is None:
+        f_b = func(b)
+        evaluations += 1
+    if f_a * f_b > 0:
+        return None
+    if f_a == 0:
+        return a, evaluations
+    if f_b == 0:
+        return b, evaluations
+
+    # x_cur is the best estimate, x_blk is the other end of the bracket,
+    # x_pre is the previous estimate
+    x_pre, f_pre, x_cur, f_cur = a, f_a, b, f_b
+    x_blk = f_blk = step_pre = step_cur = 0.0
+    rel_tol = 4 * sys.float_info.epsilon
+    for _ in range(max_iter):
+        if f_pre != 0 and f_cur != 0 and (f_pre < 0) != (f_cur < 0):
+            x_blk, f_blk = x_pre, f_pre
+            step_pre = step_cur = x_cur - x_pre
+        if abs(f_blk) < abs(f_cur):
+            x_pre, x_cur, x_blk = x_cur, x_blk, x_cur
+            f_pre, f_cur, f_blk = f_cur, f_blk, f_cur
+
+        delta = (tol + rel_tol * abs(x_cur)) / 2
+        step_bisect = (x_blk - x_cur) / 2
+        if f_cur == 0 or abs(step_bisect) < delta:
+            return x_cur, evaluations
+
+        if abs(step_pre) > delta and abs(f_cur) < abs(f_pre):
+            if x_pre == x_blk:
+                # secant step
+                step_try = -f_cur * (x_cur - x_pre) / (f_cur - f_pre)
             else:
-                a = midpoint
+                # inverse quadratic interpolation
+                d_pre = (f_pre - f_cur) / (x_pre - x_cur)
+                d_blk = (f_blk - f_cur) / (x_blk - x_cur)
+                step_try = (-f_cur * (f_blk * d_blk - f_pre * d_pre)
+                            / (d_blk * d_pre * (f_blk - f_pre)))
+            if 2 * abs(step_try) < min(abs(step_pre), 3 * abs(step_bisect) - delta):
+                step_pre, step_cur = step_cur, step_try
+            else:
+                step_pre = step_cur = step_bisect
+        else:
+            step_pre = step_cur = step_bisect
+
+        x_pre, f_pre = x_cur, f_cur
+        if abs(step_cur) > delta:
+            x_cur += step_cur
+        else:
+            x_cur += delta if step_bisect > 0 else -delta
+        f_cur = func(x_cur)
+        evaluations += 1
+    return x_cur, evaluations
 
-        root = round(midpoint, 2)
-        return root
+
+def find_brackets(func: callable, a: float, b: float, samples: int = 100) -> list[tuple]:
+    """Find subintervals of [a, b] where the function changes sign, by
+    evaluating it once at samples + 1 evenly spaced points.
+
+    Returns:
+        list[tuple]: Tuples (start, end, func(start), func(end)); for a
+            sample point where the function is zero, start == end.
+
+    Examples:
+    >>> [(x_0, x_1) for x_0, x_1, _, _ in find_brackets(lambda x: x**2 - 1, -2, 2, 4)]
+    [(-1.0, -1.0), (1.0, 1.0)]
+    >>> [(x_0, x_1) for x_0, x_1, _, _ in find_brackets(lambda x: x**2 - 2, -2, 2, 4)]
+    [(-2.0, -1.0), (1.0, 2.0)]
+    """
+    points = [a + (b - a) * i / samples for i in range(samples + 1)]
+    values = [func(point) for point in points]
+    brackets = []
+    for i, (point, value) in enumerate(zip(points, values)):
+        if value == 0:
+            brackets.append((point, point, value, value))
+        elif i > 0 and values[i - 1] != 0 and (values[i - 1] < 0) != (value < 0):
+            brackets.append((points[i - 1], point, values[i - 1], value))
+    return brackets
+
+
+def _solve_bracket(arguments: tuple) -> float:
+    """Find the root in one bracket, used by find_roots in worker processes."""
+    func, start, end, f_start, f_end, tol = arguments
+    if start == end:
+        return start
+    return find_root(func, start, end, tol, f_start, f_end)[0]
+
+
+def find_roots(func: callable, a: float, b: float, samples: int = 100,
+               tol: float = ROOT_TOLERANCE, processes: int | None = None) -> list[float]:
+    """Find all roots of a function in [a, b] which are separated by a sign
+    change on a grid of samples + 1 points. The brackets are solved with
+    find_root, reusing the values at their ends; with processes > 1 they
+    are solved in parallel in a process pool (func must then be picklable,
+    e.g. a module-level function).
+
+    Examples:
+    >>> import math
+    >>> [round(root, 4) for root in find_roots(math.sin, -1, 7)]
+    [0.0, 3.1416, 6.2832]
+    """
+    brackets = find_brackets(func, a, b, samples)
+    tasks = [(func, *bracket, tol) for bracket in brackets]
+    if processes is not None and processes > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            return list(executor.map(_solve_bracket, tasks))
+    return [_solve_bracket(task) for task in tasks]
 
 
 if __name__ == '__main__':
@@ -1,4 +1,10 @@
 """Search for lucky tram tickets"""
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
 def happy_number(number: int) -> bool:
     """
     Determines if a ticket number is a happy number.
@@ -77,15 +83,90 @@ def count_happy_numbers(n: int) -> int:
     9999
     """
     if isinstance(n, int) and n >= 0:
-        counter = 0
-        for i in range(1, n + 1):
-            is_happy = happy_number(i)
-            if is_happy:
-                counter += 1
-        return counter
+        # the ticket 0 is happy too, but the count starts from 1
+        return _count_happy_upto(n) - 1
     return None
 
 
+HALF = 10 ** 4
+LAST_TICKET = HALF * HALF - 1
+
+
+def _digital_root(number: int) -> int:
+    """
+    Returns the digital root of a number (the sum of digits is taken while
+    it has more than one digit). It is the same as for the sum of digits of
+    the number, so a half of a ticket is reduced without summing digits.
+
+    >>> _digital_root(0), _digital_root(9), _digital_root(1234), _digital_root(9999)
+    (0, 9, 1, 9)
+    """
+    return 1 + (number - 1) % 9 if number else 0
+
+
+def _count_roots_upto(m: int, root: int) -> int:
+    """
+    Counts the numbers from 0 to m inclusive with the given digital root.
+    Roots 1..9 repeat with period 9 starting from 1, only 0 has root 0.
+
+    >>> _count_roots_upto(9999, 0), _count_roots_upto(9999, 5)
+    (1, 1111)
+    >>> _count_roots_upto(13, 4), _count_roots_upto(3, 4)
+    (2, 0)
+    """
+    if m < 0:
+        return 0
+    if root == 0:
+        return 1
+    if m < root:
+        return 0
+    return (m - root) // 9 + 1
+
+
+# How many 4-digit halves 0000..9999 reduce to every digital root.
+HALF_ROOT_COUNTS = [_count_roots_upto(HALF - 1, root) for root in range(10)]
+
+
+def _count_happy_upto(n: int) -> int:
+    """
+    Counts happy tickets from 0 to n inclusive without checking them one by
+    one. For every first half below the first half of n, all second halves
+    0000..9999 are possible, so only their digital root matters; for the
+    first half of n itself, second halves go up to the second half of n.
+
+    >>> _count_happy_upto(99999999)
+    11108890
+    """
+    if n < 0:
+        return 0
+    n = min(n, LAST_TICKET)
+    first, second = divmod(n, HALF)
+    # first halves 0 .. first - 1: 0 has root 0, the rest have roots 1..9
+    count = 0
+    if first > 0:
+        count += HALF_ROOT_COUNTS[0]
+        for root in range(1, 10):
+            count += _count_roots_upto(first - 1, root) * HALF_ROOT_COUNTS[root]
+    return count + _count_roots_upto(second, _digital_root(first))
+
+
+def count_happy_range(m: int, n: int) -> int:
+    """
+    Counts happy tickets from m to n inclusive, the same as
+    len(happy_numbers(m, n)), but without listing them.
+
+    >>> count_happy_range(10001, 10100)
+    12
+    >>> count_happy_range(0, 0), count_happy_range(5, 1)
+    (1, 0)
+    """
+    if not isinstance(m, int) or not isinstance(n, int):
+        return None
+    if n < m:
+        return 0
+    return _count_happy_upto(n) - _count_happy_upto(m - 1)
+
+
 
 
 def happy_numbers(m: int, n: int) -> list[int]:
@@ -109,12 +190,87 @@ def happy_numbers(m: int, n: int) -> list[int]:
     [10001, 10010, 10019, 10028, 10037, 10046, 10055, 10064, 10073, 10082, 10091, 10100]
     """
     list_happy_tickets = []
-    for k in range(m, n + 1):
-        if happy_number(k):
-            list_happy_tickets.append(k)
+    for chunk in iter_happy_numbers(m, n):
+        list_happy_tickets.extend(chunk if isinstance(chunk, list) else chunk.tolist())
     return list_happy_tickets
 
 
+def iter_happy_numbers(m: int, n: int, chunk_size: int = 1 << 20):
+    """
+    Generates happy ticket numbers from m to n inclusive in chunks, in
+    increasing order.
+
+    Tickets with the same first half are happy when the digital root of the
+    second half, 1 + (s - 1) % 9, is the root of the first one. Second
+    halves with root r >= 1 are r, r + 9, ..., so happy tickets are listed
+    directly instead of checking every number. With NumPy, a block of first
+    halves is expanded into about chunk_size tickets at once and every chunk
+    is a NumPy array; without it, every chunk is a list for one first half.
+
+    Parameters:
+    m (int): The lower limit of ticket numbers (inclusive).
+    n (int): The upper limit of ticket numbers (inclusive).
+    chunk_size (int): Approximate number of tickets in a NumPy chunk.
+
+    >>> [int(ticket) for chunk in iter_happy_numbers(10001, 10100, 16) for ticket in chunk]
+    [10001, 10010, 10019, 10028, 10037, 10046, 10055, 10064, 10073, 10082, 10091, 10100]
+    """
+    m = max(m, 0)
+    n = min(n, LAST_TICKET)
+    if m > n:
+        return
+    if np is None:
+        yield from _iter_happy_progressions(m, n)
+        return
+
+    seconds_by_root = _seconds_by_root()
+    block = max(1, chunk_size // seconds_by_root.shape[1])
+    last_first = n // HALF
+    for start in range(m // HALF, last_first + 1, block):
+        firsts = np.arange(start, min(start + block, last_first + 1), dtype=np.int64)
+        roots = np.where(firsts == 0, 0, 1 + (firsts - 1) % 9)
+        seconds = seconds_by_root[roots]
+        tickets = firsts[:, None] * HALF + seconds
+        yield tickets[(seconds >= 0) & (tickets >= m) & (tickets <= n)]
+
+
+def _seconds_by_root():
+    """
+    Returns a NumPy table: row r holds the second halves with digital root r
+    (1111 of them for r >= 1; only 0 for r = 0, padded with -1).
+    """
+    table = np.full((10, HALF_ROOT_COUNTS[1]), -1, dtype=np.int64)
+    table[0, 0] = 0
+    for root in range(1, 10):
+        table[root] = np.arange(root, HALF, 9)
+    return table
+
+
+def _iter_happy_progressions(m: int, n: int):
+    """
+    Generates lists of happy tickets from m to n inclusive, one list per
+    first half.
+
+    >>> list(_iter_happy_progressions(0, 10010))
+    [[0], [10001, 10010]]
+    >>> list(_iter_happy_progressions(9990, 10030))
+    [[10001, 10010, 10019, 10028]]
+    """
+    for first in range(m // HALF, n // HALF + 1):
+        base = first * HALF
+        low = max(m - base, 0)
+        high = min(n - base, HALF - 1)
+        root = _digital_root(first)
+        if root == 0:
+            tickets = [base] if low == 0 else []
+        else:
+            # the first second half >= low with the needed digital root
+            start = low + (root - _digital_root(low)) % 9 if low else root
+            tickets = list(range(base + start, base + high + 1, 9))
+        if tickets:
+            yield tickets
+
+
 
 
 if __name__ == '__main__':
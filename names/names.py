@@ -1,4 +1,65 @@
 """Analyzes baby name statistics for the Lviv region (2017) using search and sort algorithms."""
+import heapq
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+
+def _read_names(file_path):
+    """Yield (name, frequency) pairs from a name file, skipping its header line.
+
+    >>> next(_read_names('boy_names.txt'))
+    ('ААРОН', 2)
+    """
+    with open(file_path, 'r', encoding="utf-8") as file:
+        file.readline()
+        for line in file:
+            name, freq = line.split('\t', 1)
+            yield name.strip(), int(freq.strip("()\n"))
+
+
+def _analyse_names(pairs) -> tuple[{str}, (int, {str}), (str, int, int)]:
+    """Analyse (name, frequency) pairs and return the tuple described in find_names.
+
+    Everything is collected in one pass: a heap of the three most popular names,
+    the names that occur only once and per-letter counters of names and children.
+    If a name is repeated, its last frequency is used.
+
+    >>> top, unique, letter = _analyse_names([('ОЛЯ', 5), ('ОКСАНА', 1), ('ІРА', 5), ('ЯНА', 2)])
+    >>> sorted(top), unique, letter
+    (['ІРА', 'ОЛЯ', 'ЯНА'], (1, {'ОКСАНА'}), ('О', 2, 6))
+    """
+    all_names = {}
+    for name, freq in pairs:
+        all_names[name] = freq
+
+    # (freq, -index, name): among equal frequencies earlier names are more popular.
+    top = []
+    unique_name = set()
+    letters = {}
+    for index, (name, freq) in enumerate(all_names.items()):
+        item = (freq, -index, name)
+        if len(top) < 3:
+            heapq.heappush(top, item)
+        elif item > top[0]:
+            heapq.heapreplace(top, item)
+
+        if freq == 1:
+            unique_name.add(name)
+
+        counter = letters.get(name[0])
+        if counter is None:
+            letters[name[0]] = [1, freq]
+        else:
+            counter[0] += 1
+            counter[1] += freq
+
+    three_most_freq = {name for _, _, name in top}
+    letter, (count_names, count_kids) = max(letters.items(), key=lambda x: x[1][0])
+
+    return ((three_most_freq, (len(unique_name), unique_name),
+            (letter, count_names, count_kids)))
+
+
 def find_names(file_path) -> tuple[{str}, (int, {str}), (str, int, int)]:
     """Read file, analyse names and return a tuple of different info.
 
@@ -16,57 +77,62 @@ def find_names(file_path) -> tuple[{str}, (int, {str}), (str, int, int)]:
                 the second is the number of such names, and the third element is the number
                 of children with those names.
     """
-    all_names = {}
-    with open(file_path, 'r', encoding="utf-8") as file:
-        file.readline()
-        for line in file:
-            parts = line.split('\t', 1)
-            name = parts[0].strip()
-            freq = parts[1].strip("()\n")
-            freq = int(freq)
-            all_names[name] = freq
-
-    # three_most_freq = sorted(all_names.items(), key=lambda x: x[1], reverse=True)[:3]
-    list_all_names = list(all_names.items())
-    def insertion_sort(lst):
-        for i in range(1, len(lst)):
-            temp = lst[i]
-            j = i - 1
-            while j >= 0 and lst[j][1] < temp[1]:
-                lst[j + 1] = lst[j]
-                j -= 1
-            lst[j + 1] = temp
-        return lst
-
-    sorted_all_names = insertion_sort(list_all_names)
-
-    three_most_freq = set(name for name, _ in sorted_all_names[:3])
-
-    # unique_name = {name for name, freq in all_names.items() if freq == 1}
-
-    def linear_search(dictionary, value):
-        found_keys = set()
-        for key, val in dictionary.items():
-            if val == value:
-                found_keys.add(key)
-        return found_keys
-
-    unique_name = linear_search(all_names, 1)
-
-    dict_letter = {}
-    for name in all_names:
-        first_letter = name[0]
-        if first_letter not in dict_letter:
-            dict_letter[first_letter] = set()
-        dict_letter[first_letter].add(name)
-
-    letter = max(dict_letter.items(), key=lambda x: len(x[1]))[0]
-    names_startswith_letter = dict_letter[letter]
-    count_names = len(names_startswith_letter)
-    count_kids = sum(all_names[name] for name in names_startswith_letter)
+    return _analyse_names(_read_names(file_path))
 
-    return ((three_most_freq, (len(unique_name), unique_name),
-            (letter, count_names, count_kids)))
+
+def _count_names(file_path) -> Counter:
+    """Read a name file into a Counter of frequencies (the last one wins for repeated names)."""
+    return Counter(dict(_read_names(file_path)))
+
+
+class NameRegistry:
+    """Name statistics of many files (one per region and year).
+
+    Every file is read once; the answers of find_names for any subset of files
+    are computed from the stored counters, with frequencies of the same name
+    added up across files.
+
+    >>> registry = NameRegistry()
+    >>> registry.add_files(['boy_names.txt', 'girl_names.txt'])
+    >>> top, unique, letter = registry.find_names(['boy_names.txt'])
+    >>> (top, unique, letter) == find_names('boy_names.txt')
+    True
+    >>> top, (count, _), letter = registry.find_names()
+    >>> sorted(top), count, letter
+    (['МАКСИМ', 'МАТВІЙ', 'СОФІЯ'], 340, ('А', 96, 2817))
+    """
+
+    def __init__(self):
+        self.counts = {}
+
+    def add_files(self, file_paths, max_workers=None) -> None:
+        """Read files in a process pool and store their counters.
+        A file that was already added is read again."""
+        file_paths = list(file_paths)
+        if len(file_paths) == 1:
+            self.counts[file_paths[0]] = _count_names(file_paths[0])
+            return
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            for file_path, counts in zip(file_paths, executor.map(_count_names, file_paths)):
+                self.counts[file_path] = counts
+
+    def combined(self, file_paths=None) -> Counter:
+        """Return the frequencies of the given files (all files by default) added up."""
+        if file_paths is None:
+            file_paths = self.counts
+        total = Counter()
+        for file_path in file_paths:
+            total.update(self.counts[file_path])
+        return total
+
+    def find_names(self, file_paths=None) -> tuple[{str}, (int, {str}), (str, int, int)]:
+        """Return the tuple of find_names for the given files taken together."""
+        return _analyse_names(self.combined(file_paths).items())
+
+    def find_names_per_file(self) -> dict:
+        """Return the tuple of find_names for every file separately."""
+        return {file_path: _analyse_names(counts.items())
+                for file_path, counts in self.counts.items()}
 
 
 
@@ -1,5 +1,40 @@
 """Builds note-link graphs from Markdown files and exports them to DOT."""
+import mmap
+import os
 import re
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+LINK_PATTERN = re.compile(rb"\[\[(.*?)\]\]")
+
+
+def _note_name(note_path: str) -> str:
+    """
+    Returns the name of the note (file name without extension).
+
+    >>> _note_name("notes/note4.md")
+    'note4'
+    """
+    return note_path.split("/")[-1].rsplit(".", 1)[0]
+
+
+def _read_links(note_path: str) -> set:
+    """
+    Reads the note file and returns the set of the names of notes it links to.
+
+    The file is memory-mapped and scanned with a bytes regex, so only the
+    matched names are decoded and memory use does not grow with the size
+    of the note.
+
+    >>> sorted(_read_links("notes/note2.md"))
+    ['note', 'note1', 'note3']
+    """
+    with open(note_path, 'rb') as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            return set()
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as content:
+            return {match.group(1).decode('utf-8')
+                    for match in LINK_PATTERN.finditer(content)}
+
 
 def build_graph_from_note(note_path: str, graph = None) -> dict:
     """
@@ -20,18 +55,14 @@ def build_graph_from_note(note_path: str, graph = None) -> dict:
     >>> build_graph_from_note("notes/note3.md")
     {}
     """
-    note_name = note_path.split("/")[-1].rsplit(".", 1)[0]
+    note_name = _note_name(note_path)
     file_path = note_path.rsplit('/',1)[0] + '/'
     if graph is None:
         graph = {}
     if note_name in graph:
         return graph
 
-    with open(note_path, 'r', encoding='utf-8') as file:
-        content = file.read()
-
-    pattern = re.compile(r"\[\[(.*?)\]\]")
-    names = pattern.findall(content)
+    names = _read_links(note_path)
 
     if names:
         graph.setdefault(note_name, [])
@@ -43,6 +74,165 @@ def build_graph_from_note(note_path: str, graph = None) -> dict:
     return graph
 
 
+def build_graph_parallel(note_path: str, max_workers: int = 8) -> dict:
+    """
+    Builds the same graph as build_graph_from_note, but reads the linked notes
+    concurrently. Notes are crawled by frontier: every note that has been
+    discovered is submitted to a bounded thread pool at once, so slow file
+    reads overlap instead of happening one after another.
+
+    Args:
+        note_path (str): Path to the file with note, that needed to build a graph for.
+        max_workers (int): Maximal number of notes that are read at the same time.
+    Returns:
+        dict: The same dictionary as build_graph_from_note returns, with sorted
+            lists of linked notes.
+
+    >>> build_graph_parallel("notes/note2.md") == build_graph_from_note("notes/note2.md")
+    True
+    >>> build_graph_parallel("notes/note.md", max_workers=1)
+    {'note': ['note4'], 'note4': ['note']}
+    >>> build_graph_parallel("notes/note3.md")
+    {}
+    """
+    graph = {}
+    visited = {_note_name(note_path)}
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending = {executor.submit(_read_links, note_path): note_path}
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                path = pending.pop(future)
+                names = future.result()
+                if not names:
+                    continue
+                links = sorted(names)
+                graph[_note_name(path)] = links
+                file_path = path.rsplit('/', 1)[0] + '/'
+                for link in links:
+                    if link not in visited:
+                        visited.add(link)
+                        link_path = file_path + link + ".md"
+                        pending[executor.submit(_read_links, link_path)] = link_path
+
+    return dict(sorted(graph.items()))
+
+
+class NoteIndex:
+    """
+    Keeps forward links, backlinks and broken links of notes together and
+    updates them incrementally, so "what links here", orphan and broken-link
+    queries do not need to crawl and invert the whole graph.
+
+    A note is an orphan if it is indexed and no note links to it.
+    A link is broken if it points to a note that is not indexed.
+
+    >>> index = NoteIndex()
+    >>> index.update_note("note", ["note4"])
+    >>> index.update_note("note4", ["note"])
+    >>> index.update_note("note2", ["note", "note1", "note3"])
+    >>> sorted(index.backlinks("note"))
+    ['note2', 'note4']
+    >>> sorted(index.orphans())
+    ['note2']
+    >>> sorted(index.broken_links())
+    ['note1', 'note3']
+    >>> index.update_note("note1", [])
+    >>> sorted(index.broken_links())
+    ['note3']
+    >>> index.remove_note("note2")
+    >>> sorted(index.orphans())
+    ['note1']
+    >>> index.graph()
+    {'note': ['note4'], 'note4': ['note']}
+    """
+
+    def __init__(self):
+        self.forward = {}
+        self.backward = {}
+        self._orphans = set()
+        self._missing = set()
+
+    def update_note(self, note_name: str, links) -> None:
+        """
+        Adds the note to the index or replaces the links it had before.
+
+        Args:
+            note_name (str): Name of the note.
+            links (iterable[str]): Names of the notes it links to.
+        """
+        if note_name not in self.forward:
+            self.forward[note_name] = set()
+            self._missing.discard(note_name)
+            if not self.backward.get(note_name):
+                self._orphans.add(note_name)
+
+        old_links = self.forward[note_name]
+        new_links = set(links)
+        for link in old_links - new_links:
+            self._unlink(note_name, link)
+        for link in new_links - old_links:
+            self.backward.setdefault(link, set()).add(note_name)
+            self._orphans.discard(link)
+            if link not in self.forward:
+                self._missing.add(link)
+        self.forward[note_name] = new_links
+
+    def remove_note(self, note_name: str) -> None:
+        """
+        Removes the note and its links from the index. Links to the removed
+        note from other notes become broken.
+        """
+        if note_name not in self.forward:
+            return
+        for link in self.forward.pop(note_name):
+            self._unlink(note_name, link)
+        self._orphans.discard(note_name)
+        if self.backward.get(note_name):
+            self._missing.add(note_name)
+
+    def add_note_file(self, note_path: str) -> None:
+        """
+        Reads the note file and (re)indexes its links.
+        """
+        self.update_note(_note_name(note_path), _read_links(note_path))
+
+    def _unlink(self, note_name: str, link: str) -> None:
+        sources = self.backward[link]
+        sources.discard(note_name)
+        if not sources:
+            del self.backward[link]
+            if link in self.forward:
+                self._orphans.add(link)
+            else:
+                self._missing.discard(link)
+
+    def backlinks(self, note_name: str) -> set:
+        """
+        Returns the set of the notes which link to the given note.
+        """
+        return set(self.backward.get(note_name, ()))
+
+    def orphans(self) -> set:
+        """
+        Returns the set of the indexed notes nobody links to.
+        """
+        return set(self._orphans)
+
+    def broken_links(self) -> dict:
+        """
+        Returns a dictionary: keys are names of the missing notes and the
+        values are sets of the notes that link to them.
+        """
+        return {link: set(self.backward[link]) for link in self._missing}
+
+    def graph(self) -> dict:
+        """
+        Returns the index in the format of build_graph_from_note.
+        """
+        return {name: sorted(links) for name, links in sorted(self.forward.items())
+                if links}
+
 
 def convert_to_dot(graph: dict):
     """
@@ -1,4 +1,15 @@
 """Construct a list of lucky numbers that do not exceed a given number n"""
+from array import array
+from bisect import bisect_right
+from itertools import compress, islice
+
+SEGMENT_SIZE = 1 << 16
+
+# All lucky numbers that do not exceed _lucky_known, in increasing order.
+_lucky_table = array('q', [1, 3])
+_lucky_known = 3
+
+
 def sieve_flavius(n: int) -> list[int]:
     '''Generates a list of lucky numbers not exceeding the given number n.
 
@@ -20,28 +31,194 @@ def sieve_flavius(n: int) -> list[int]:
     if n == 0:
         return []
     if isinstance(n, int) and n > 0:
-        list_lucky_num = []
+        list_lucky_num = list(range(1, n + 1, 2))
 
-        for i in range(1, n + 1, 2):
-            list_lucky_num.append(i)
-        # print(list_lucky_num)
+        # While the removal step is small, most of the list goes away on
+        # every pass and deleting a slice is the cheapest way to do it.
         step_index = 1
         while step_index < len(list_lucky_num):
             removal_step = list_lucky_num[step_index]
-
             if removal_step >= len(list_lucky_num):
+                return list_lucky_num
+            if removal_step > len(list_lucky_num).bit_length() << 10:
                 break
+            del list_lucky_num[removal_step - 1::removal_step]
+            step_index += 1
+        else:
+            return list_lucky_num
 
-            for index in range(len(list_lucky_num)-1, -1, -1):
-                if (index + 1) % removal_step == 0:
-                    list_lucky_num.pop(index)
-
-            # print(list_lucky_num)
+        # Then only a few numbers are removed per pass: they are marked in a
+        # bytearray and found by their position with a Fenwick tree.
+        size = len(list_lucky_num)
+        alive = bytearray(b'\x01') * size
+        tree = _fenwick_tree(size)
+        length = size
+        while step_index < length:
+            removal_step = list_lucky_num[_fenwick_find(tree, step_index + 1)]
+            if removal_step >= length:
+                break
+            for position in range(length - length % removal_step, 0, -removal_step):
+                index = _fenwick_find(tree, position)
+                alive[index] = 0
+                _fenwick_remove(tree, index)
+            length -= length // removal_step
             step_index += 1
-        return list_lucky_num
+        return list(compress(list_lucky_num, alive))
     return None
 
 
+def _fenwick_tree(size: int) -> list[int]:
+    """Builds a Fenwick tree over size elements which are all present.
+
+    >>> _fenwick_tree(8)
+    [0, 1, 2, 1, 4, 1, 2, 1, 8]
+    """
+    return [i & -i for i in range(size + 1)]
+
+
+def _fenwick_remove(tree: list[int], index: int) -> None:
+    """Marks the element with the given (0-based) index as removed.
+
+    >>> tree = _fenwick_tree(4)
+    >>> _fenwick_remove(tree, 1)
+    >>> tree
+    [0, 1, 1, 1, 3]
+    """
+    index += 1
+    size = len(tree) - 1
+    while index <= size:
+        tree[index] -= 1
+        index += index & -index
+
+
+def _fenwick_find(tree: list[int], k: int) -> int:
+    """Returns the (0-based) index of the k-th present element.
+
+    >>> tree = _fenwick_tree(4)
+    >>> _fenwick_remove(tree, 1)
+    >>> [_fenwick_find(tree, k) for k in (1, 2, 3)]
+    [0, 2, 3]
+    """
+    size = len(tree) - 1
+    position = 0
+    bit = 1 << size.bit_length() - 1 if size else 0
+    while bit:
+        following = position + bit
+        if following <= size and tree[following] < k:
+            position = following
+            k -= tree[following]
+        bit >>= 1
+    return position
+
+
+def _extend_lucky_table(limit: int) -> None:
+    """Sieves the next segments of odd numbers until every lucky number that
+    does not exceed limit is in the table.
+
+    A segment is sieved on its own: the number at position p (among the
+    numbers left) is removed by step l if p is divisible by l and otherwise
+    moves to position p - p // l. So only the position of the first number
+    of the segment has to be tracked, and the steps are the lucky numbers
+    up to the last position, which are already in the table.
+    """
+    global _lucky_known
+    while _lucky_known < limit:
+        first = (_lucky_known + 1) // 2 + 1
+        last = min(first + SEGMENT_SIZE - 1, 2 * first - 2)
+        segment = list(range(2 * first - 1, 2 * last, 2))
+        start = first
+        for step in islice(_lucky_table, 1, None):
+            if step >= start + len(segment):
+                break
+            del segment[-start % step::step]
+            start -= (start - 1) // step
+        _lucky_table.extend(segment)
+        _lucky_known = 2 * last - 1
+
+
+def lucky_numbers():
+    """Generates lucky numbers in increasing order, without an upper limit.
+
+    The numbers are sieved lazily, one segment at a time, and kept in a
+    table shared by lucky_numbers, is_lucky and save_lucky_table: the
+    lucky numbers found so far are the removal steps for the next segment.
+
+    Unlike sieve_flavius(n), which stops as soon as the step is not less
+    than the number of numbers left and so may keep the last one, every
+    number generated here stays lucky whatever the upper limit.
+
+    >>> from itertools import islice
+    >>> list(islice(lucky_numbers(), 12))
+    [1, 3, 7, 9, 13, 15, 21, 25, 31, 33, 37, 43]
+    >>> sieve_flavius(5), [x for x in islice(lucky_numbers(), 3) if x <= 5]
+    ([1, 3, 5], [1, 3])
+    """
+    index = 0
+    while True:
+        while index >= len(_lucky_table):
+            _extend_lucky_table(_lucky_known + 1)
+        yield _lucky_table[index]
+        index += 1
+
+
+def is_lucky(number: int) -> bool:
+    """Checks whether the number is lucky.
+
+    Numbers covered by the table are found by binary search. For a larger
+    number only the lucky numbers up to half of it are needed: its position
+    among the odd numbers is followed through every removal step.
+
+    >>> [x for x in range(1, 50) if is_lucky(x)]
+    [1, 3, 7, 9, 13, 15, 21, 25, 31, 33, 37, 43, 49]
+    >>> is_lucky(1000003), is_lucky(1000005)
+    (True, False)
+    """
+    if number < 1 or number % 2 == 0:
+        return False
+    if number <= _lucky_known:
+        index = bisect_right(_lucky_table, number) - 1
+        return _lucky_table[index] == number
+
+    position = (number + 1) // 2
+    _extend_lucky_table(position)
+    for step in islice(_lucky_table, 1, None):
+        if step > position:
+            return True
+        if position % step == 0:
+            return False
+        position -= position // step
+    return True
+
+
+def save_lucky_table(path: str) -> None:
+    """Saves the table of lucky numbers computed so far to a binary file."""
+    with open(path, 'wb') as file:
+        array('q', [_lucky_known]).tofile(file)
+        _lucky_table.tofile(file)
+
+
+def load_lucky_table(path: str) -> None:
+    """Loads a table saved by save_lucky_table, if it covers more numbers
+    than the one in memory, so earlier sieving does not have to be repeated.
+
+    >>> import os, shutil, tempfile
+    >>> folder = tempfile.mkdtemp()
+    >>> path = os.path.join(folder, 'lucky_table.bin')
+    >>> save_lucky_table(path)
+    >>> load_lucky_table(path)
+    >>> shutil.rmtree(folder)
+    """
+    global _lucky_table, _lucky_known
+    table = array('q')
+    with open(path, 'rb') as file:
+        table.frombytes(file.read())
+    if len(table) < 3 or table[1] != 1 or table[2] != 3:
+        raise ValueError(f'{path} is not a table of lucky numbers')
+    if table[0] > _lucky_known:
+        _lucky_known = table[0]
+        _lucky_table = table[1:]
+
+
 # print(sieve_flavius(100))
 
 
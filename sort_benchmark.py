@@ -0,0 +1,252 @@
+"""Reproducible benchmark of the sorting algorithms from algorithms.py
+
+Every algorithm is run on the same generated inputs and the time, the
+number of comparisons and the peak memory are reported. The results can
+be saved as JSON to compare runs across commits:
+
+    python sort_benchmark.py --sizes 1000 10000 --output bench.json
+"""
+import argparse
+import json
+import platform
+import random
+import subprocess
+import time
+import tracemalloc
+
+import algorithms
+
+ALGORITHMS = {
+    'selection_sort': algorithms.selection_sort,
+    'insertion_sort': algorithms.insertion_sort,
+    'quick_sort': algorithms.quick_sort,
+    'merge_sort': algorithms.merge_sort,
+    'sorted': sorted,
+}
+QUADRATIC = {'selection_sort', 'insertion_sort'}
+
+
+def random_data(size: int, rng: random.Random) -> list[int]:
+    """
+    Returns random integers.
+
+    >>> random_data(5, random.Random(0))
+    [24, 48, 26, 2, 16]
+    """
+    return [rng.randrange(size * 10) for _ in range(size)]
+
+
+def sorted_data(size: int, rng: random.Random) -> list[int]:
+    """
+    Returns already sorted integers.
+
+    >>> sorted_data(5, random.Random(0))
+    [0, 1, 2, 3, 4]
+    """
+    return list(range(size))
+
+
+def reversed_data(size: int, rng: random.Random) -> list[int]:
+    """
+    Returns integers sorted in reverse order.
+
+    >>> reversed_data(5, random.Random(0))
+    [4, 3, 2, 1, 0]
+    """
+    return list(range(size - 1, -1, -1))
+
+
+def duplicates_data(size: int, rng: random.Random) -> list[int]:
+    """
+    Returns integers with only ten different values.
+
+    >>> sorted(set(duplicates_data(1000, random.Random(0))))
+    [0, 1, 2, 3, 4, 5, 6, 7, 8, 9]
+    """
+    return [rng.randrange(10) for _ in range(size)]
+
+
+def nearly_sorted_data(size: int, rng: random.Random) -> list[int]:
+    """
+    Returns sorted integers where about 1% of the elements were swapped.
+
+    >>> data = nearly_sorted_data(1000, random.Random(0))
+    >>> sorted(data) == list(range(1000)), data == list(range(1000))
+    (True, False)
+    """
+    data = list(range(size))
+    for _ in range(max(1, size // 100)):
+        i = rng.randrange(size)
+        j = rng.randrange(size)
+        data[i], data[j] = data[j], data[i]
+    return data
+
+
+DISTRIBUTIONS = {
+    'random': random_data,
+    'sorted': sorted_data,
+    'reversed': reversed_data,
+    'duplicates': duplicates_data,
+    'nearly_sorted': nearly_sorted_data,
+}
+
+
+class Counted:
+    """
+    Wrapper of a value which counts every comparison made with it.
+
+    >>> Counted.comparisons = 0
+    >>> data = algorithms.merge_sort([Counted(3), Counted(1), Counted(2)])
+    >>> [item.value for item in data], Counted.comparisons
+    ([1, 2, 3], 3)
+    """
+    __slots__ = ('value',)
+    comparisons = 0
+
+    def __init__(self, value):
+        self.value = value
+
+    def __lt__(self, other):
+        Counted.comparisons += 1
+        return self.value < other.value
+
+    def __le__(self, other):
+        Counted.comparisons += 1
+        return self.value <= other.value
+
+    def __gt__(self, other):
+        Counted.comparisons += 1
+        return self.value > other.value
+
+    def __ge__(self, other):
+        Counted.comparisons += 1
+        return self.value >= other.value
+
+    def __eq__(self, other):
+        Counted.comparisons += 1
+        return self.value == other.value
+
+    __hash__ = None
+
+
+def measure(func, data: list, repeat: int = 3) -> dict:
+    """
+    Runs func on copies of data and returns the best time in seconds,
+    the number of comparisons and the peak memory in bytes.
+
+    >>> result = measure(sorted, [3, 1, 2], repeat=1)
+    >>> sorted(result), result['comparisons']
+    (['comparisons', 'peak_memory', 'time'], 4)
+    """
+    best = None
+    for _ in range(repeat):
+        copy = list(data)
+        start = time.perf_counter()
+        func(copy)
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+
+    Counted.comparisons = 0
+    func([Counted(value) for value in data])
+    comparisons = Counted.comparisons
+
+    copy = list(data)
+    tracemalloc.start()
+    try:
+        func(copy)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {'time': best, 'comparisons': comparisons, 'peak_memory': peak}
+
+
+def _commit() -> str | None:
+    try:
+        result = subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True,
+                                text=True, check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return result.stdout.strip()
+
+
+def run_benchmarks(names: list[str], distributions: list[str], sizes: list[int],
+                   seed: int = 0, repeat: int = 3, max_quadratic: int = 5000) -> dict:
+    """
+    Benchmarks every algorithm on every distribution and size.
+
+    Inputs are generated from seed, so two runs get exactly the same data.
+    Quadratic algorithms are skipped for sizes above max_quadratic.
+
+    >>> report = run_benchmarks(['quick_sort', 'insertion_sort'], ['sorted'], [10, 20],
+    ...                         repeat=1, max_quadratic=10)
+    >>> [(r['algorithm'], r['size'], r.get('skipped', False)) for r in report['results']]
+    [('quick_sort', 10, False), ('insertion_sort', 10, False), \
+('quick_sort', 20, False), ('insertion_sort', 20, True)]
+    """
+    results = []
+    for distribution in distributions:
+        for size in sizes:
+            data = DISTRIBUTIONS[distribution](size, random.Random(f'{seed}-{size}'))
+            for name in names:
+                row = {'algorithm': name, 'distribution': distribution, 'size': size}
+                if name in QUADRATIC and size > max_quadratic:
+                    row['skipped'] = True
+                else:
+                    try:
+                        row.update(measure(ALGORITHMS[name], data, repeat))
+                    except RecursionError:
+                        row['error'] = 'RecursionError'
+                results.append(row)
+
+    return {
+        'seed': seed,
+        'repeat': repeat,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'commit': _commit(),
+        'results': results,
+    }
+
+
+def print_report(report: dict) -> None:
+    """Prints the results as a table."""
+    print(f"{'algorithm':<16}{'distribution':<15}{'size':>9}"
+          f"{'time, s':>12}{'comparisons':>14}{'peak, KiB':>11}")
+    for row in report['results']:
+        start = f"{row['algorithm']:<16}{row['distribution']:<15}{row['size']:>9}"
+        if row.get('skipped'):
+            print(start + f"{'skipped':>12}")
+        elif 'error' in row:
+            print(start + f"{row['error']:>12}")
+        else:
+            print(start + f"{row['time']:>12.6f}{row['comparisons']:>14}"
+                  f"{row['peak_memory'] / 1024:>11.1f}")
+
+
+def main():
+    """Parses the command line arguments and runs the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--algorithms', nargs='+', choices=list(ALGORITHMS),
+                        default=list(ALGORITHMS))
+    parser.add_argument('--distributions', nargs='+', choices=list(DISTRIBUTIONS),
+                        default=list(DISTRIBUTIONS))
+    parser.add_argument('--sizes', nargs='+', type=int, default=[100, 1000, 10000])
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--max-quadratic', type=int, default=5000,
+                        help='largest size for selection and insertion sort')
+    parser.add_argument('--output', help='path of the JSON file with results')
+    args = parser.parse_args()
+
+    report = run_benchmarks(args.algorithms, args.distributions, args.sizes,
+                            args.seed, args.repeat, args.max_quadratic)
+    print_report(report)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            json.dump(report, file, indent=2)
+
+
+if __name__ == '__main__':
+    main()
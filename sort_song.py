@@ -1,4 +1,11 @@
 """Sorts songs by the specified parameter (key)"""
+import heapq
+import os
+import tempfile
+from array import array
+from collections import OrderedDict
+from itertools import islice
+from operator import itemgetter
 from typing import Callable
 
 
@@ -97,6 +104,266 @@ def sort_songs(
     
     return None
 
+# Positions of the parsed fields in a row made by parse_song.
+SONG_FIELDS = {song_length: 2, title_length: 3, last_word: 4}
+
+
+def parse_song(title: str, length: str, keys=None) -> tuple:
+    '''Parses a song once into a row with the values of the sort keys.
+
+    Parameters:
+    title (str): The song title.
+    length (str): The song length.
+    keys (list[Callable]): The keys whose values are needed (all of
+    SONG_FIELDS by default); the fields of other keys are None, so a
+    length that is not a number does not matter when sorting by title.
+
+    Returns:
+    tuple: (title, length, length as float, title length,
+    first letter of the last word).
+
+    >>> parse_song('Той день', '3.58')
+    ('Той день', '3.58', 3.58, 8, 'д')
+    >>> parse_song('Той день', '3:58', [title_length])
+    ('Той день', '3:58', None, 8, None)
+    '''
+    song = (title, length)
+    row = [title, length, None, None, None]
+    for key in SONG_FIELDS if keys is None else keys:
+        if key in SONG_FIELDS:
+            row[SONG_FIELDS[key]] = key(song)
+    return tuple(row)
+
+
+def row_key(keys) -> Callable[[tuple], object]:
+    '''Returns the key function for rows made by parse_song which sorts by
+    several keys at once: by the first one, then by the second one, and so on.
+    The keys song_length, title_length and last_word are read from the row;
+    any other key function is called with (title, length).
+
+    >>> row_key([title_length, song_length])(parse_song('Сосни', '4.31'))
+    (5, 4.31)
+    '''
+    keys = tuple(keys)
+    if all(key in SONG_FIELDS for key in keys):
+        return itemgetter(*(SONG_FIELDS[key] for key in keys))
+
+    def key_of_row(row):
+        values = tuple(row[SONG_FIELDS[key]] if key in SONG_FIELDS else key(row[:2])
+                       for key in keys)
+        return values if len(values) > 1 else values[0]
+    return key_of_row
+
+
+def sort_songs_by(
+        song_titles: list[str],
+        length_songs: list[str],
+        keys: list[Callable[[tuple], int | str | float]]) -> list[tuple] | None:
+    '''Sorts songs by several keys at once. Every song is parsed once;
+    with a single key the result is the same as sort_songs gives.
+
+    Parameters:
+    song_titles (list[str]): A list of song titles.
+    length_songs (list[str]): A corresponding list of song lengths.
+    keys (list[Callable]): The keys by which to sort, the main one first.
+
+    Returns:
+    list[tuple[str, str]]]: A sorted list of tuples (song title, song length)
+    or None if input is invalid.
+
+    >>> sort_songs_by(['Сосни', 'Той день', 'Мало мені', 'Янанебібув'],\
+                      ['4.31', '3.58', '3.19', '5.06'], [title_length, song_length])
+    [('Сосни', '4.31'), ('Той день', '3.58'), ('Мало мені', '3.19'), ('Янанебібув', '5.06')]
+    >>> sort_songs_by(['a b', 'cc'], ['3:19', '2:00'], [title_length])
+    [('cc', '2:00'), ('a b', '3:19')]
+    '''
+    if isinstance(song_titles, list) and isinstance(length_songs, list):
+        if len(song_titles) == len(length_songs):
+            keys = tuple(keys)
+            rows = [parse_song(title, length, keys)
+                    for title, length in zip(song_titles, length_songs)]
+            rows.sort(key=row_key(keys))
+            return [row[:2] for row in rows]
+        return None
+    return None
+
+
+def _split_song_line(line: str, line_number: int | None = None) -> tuple | None:
+    '''Splits a line "title<TAB>length" of a song file into (title, length).
+    Returns None for a blank line and raises ValueError for a line without a tab.
+
+    >>> _split_song_line('Сосни\\t4.31\\n')
+    ('Сосни', '4.31')
+    >>> _split_song_line('\\n') is None
+    True
+    >>> _split_song_line('Сосни 4.31\\n', 3)
+    Traceback (most recent call last):
+    ...
+    ValueError: line 3: expected "title<TAB>length", got 'Сосни 4.31'
+    '''
+    line = line.rstrip('\n')
+    if not line.strip():
+        return None
+    title, tab, length = line.partition('\t')
+    if not tab:
+        where = f'line {line_number}: ' if line_number is not None else ''
+        raise ValueError(f'{where}expected "title<TAB>length", got {line!r}')
+    return title, length
+
+
+def sort_song_file(input_path: str, output_path: str,
+                   keys: list[Callable[[tuple], int | str | float]],
+                   max_rows: int = 1_000_000) -> None:
+    '''Sorts songs from a file which may not fit in memory. Every line of the
+    files is "title<TAB>length". The file is sorted in memory by chunks of
+    max_rows songs, the chunks are written to temporary files and merged.
+    The order is the same as sort_songs_by gives. Blank lines are skipped;
+    a line without a tab raises ValueError with its number.
+
+    Parameters:
+    input_path (str): Path to the file with songs.
+    output_path (str): Path to the file for the sorted songs.
+    keys (list[Callable]): The keys by which to sort, the main one first.
+    max_rows (int): The number of songs sorted in memory at once.
+
+    >>> import os, tempfile
+    >>> folder = tempfile.mkdtemp()
+    >>> source, target = os.path.join(folder, 'in.tsv'), os.path.join(folder, 'out.tsv')
+    >>> with open(source, 'w', encoding='utf-8') as file:
+    ...     _ = file.write('Янанебібув\\t3.19\\nТой день\\t3.58\\nМало мені\\t5.06\\nСосни\\t4.31\\n\\n')
+    >>> sort_song_file(source, target, [song_length], max_rows=2)
+    >>> with open(target, encoding='utf-8') as file:
+    ...     file.read().splitlines()
+    ['Янанебібув\\t3.19', 'Той день\\t3.58', 'Сосни\\t4.31', 'Мало мені\\t5.06']
+    >>> import shutil
+    >>> shutil.rmtree(folder)
+    '''
+    keys = tuple(keys)
+    key = row_key(keys)
+
+    def line_key(line):
+        return key(parse_song(*_split_song_line(line), keys))
+
+    with tempfile.TemporaryDirectory() as folder:
+        runs = []
+        with open(input_path, 'r', encoding='utf-8') as file:
+            songs = filter(None, (_split_song_line(line, number)
+                                  for number, line in enumerate(file, 1)))
+            while True:
+                chunk = list(islice(songs, max_rows))
+                if not chunk:
+                    break
+                rows = [parse_song(title, length, keys) for title, length in chunk]
+                rows.sort(key=key)
+                run_path = os.path.join(folder, f'run_{len(runs)}.tsv')
+                with open(run_path, 'w', encoding='utf-8') as run:
+                    run.writelines(f'{row[0]}\t{row[1]}\n' for row in rows)
+                runs.append(run_path)
+
+        files = [open(run_path, 'r', encoding='utf-8') for run_path in runs]
+        try:
+            with open(output_path, 'w', encoding='utf-8') as file_out:
+                file_out.writelines(heapq.merge(*files, key=line_key))
+        finally:
+            for run in files:
+                run.close()
+
+# Sorted order for page_songs: key -> (copy of titles, copy of lengths,
+# positions of the songs in sorted order); the least recently used key is
+# dropped when there are more than CACHE_SIZE.
+CACHE_SIZE = 3
+_sorted_cache = OrderedDict()
+
+
+def top_songs(
+        song_titles: list[str],
+        length_songs: list[str],
+        key: Callable[[tuple], int | str | float],
+        k: int) -> list[tuple] | None:
+    '''Returns the first k songs in the order of sort_songs without sorting
+    all of them.
+
+    Parameters:
+    song_titles (list[str]): A list of song titles.
+    length_songs (list[str]): A corresponding list of song lengths.
+    key (Callable): The key by which to sort (song_length, title_length, last_word).
+    k (int): The number of songs to return.
+
+    Returns:
+    list[tuple[str, str]]]: The first k tuples (song title, song length)
+    or None if input is invalid.
+
+    >>> top_songs(['Янанебібув', 'Той день', 'Мало мені', 'Сосни'],\
+                  ['3.19', '3.58', '5.06', '4.31'], song_length, 2)
+    [('Янанебібув', '3.19'), ('Той день', '3.58')]
+    '''
+    if isinstance(song_titles, list) and isinstance(length_songs, list):
+        if len(song_titles) == len(length_songs):
+            return heapq.nsmallest(k, zip(song_titles, length_songs), key=key)
+        return None
+    return None
+
+
+def page_songs(
+        song_titles: list[str],
+        length_songs: list[str],
+        key: Callable[[tuple], int | str | float],
+        page: int,
+        page_size: int = 10) -> list[tuple] | None:
+    '''Returns one page of songs in the order of sort_songs.
+
+    The first page is selected with top_songs. For other pages all songs
+    are sorted once and the order is kept for the CACHE_SIZE most recently
+    used keys, so the next pages are just slices.
+
+    The cache keeps copies of the lists (references to the same strings) and
+    the sorted positions as an array of integers. It is used only if the
+    lists still have the same length and the same contents; the comparison
+    is a C-level scan which mostly checks that the items are the same
+    objects, much cheaper than sorting again, but still O(n) per request.
+
+    Parameters:
+    song_titles (list[str]): A list of song titles.
+    length_songs (list[str]): A corresponding list of song lengths.
+    key (Callable): The key by which to sort (song_length, title_length, last_word).
+    page (int): The number of the page, starting from 0.
+    page_size (int): The number of songs on a page.
+
+    Returns:
+    list[tuple[str, str]]]: The tuples (song title, song length) on the page
+    or None if input is invalid.
+
+    >>> titles = ['Янанебібув', 'Той день', 'Мало мені', 'Сосни']
+    >>> lengths = ['3.19', '3.58', '5.06', '4.31']
+    >>> page_songs(titles, lengths, song_length, 1, 2)
+    [('Сосни', '4.31'), ('Мало мені', '5.06')]
+    >>> lengths[3] = '1.00'
+    >>> page_songs(titles, lengths, song_length, 0, 2)
+    [('Сосни', '1.00'), ('Янанебібув', '3.19')]
+    '''
+    if not (isinstance(song_titles, list) and isinstance(length_songs, list)):
+        return None
+    if len(song_titles) != len(length_songs):
+        return None
+
+    start = page * page_size
+    cached = _sorted_cache.get(key)
+    if (cached is not None and len(cached[0]) == len(song_titles)
+            and cached[0] == song_titles and cached[1] == length_songs):
+        _sorted_cache.move_to_end(key)
+        return [(song_titles[i], length_songs[i]) for i in cached[2][start:start + page_size]]
+    if page == 0:
+        return top_songs(song_titles, length_songs, key, page_size)
+
+    order = array('q', sorted(range(len(song_titles)),
+                              key=lambda i: key((song_titles[i], length_songs[i]))))
+    _sorted_cache[key] = (song_titles.copy(), length_songs.copy(), order)
+    _sorted_cache.move_to_end(key)
+    if len(_sorted_cache) > CACHE_SIZE:
+        _sorted_cache.popitem(last=False)
+    return [(song_titles[i], length_songs[i]) for i in order[start:start + page_size]]
+
+
 # titles = ['Янанебібув', 'Той день', 'Мало мені', 'Сосни']
 # lengths = ['3.19', '3.58', '5.06', '4.31']
 # print(sort_songs(titles, lengths, title_length))